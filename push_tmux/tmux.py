@@ -24,8 +24,8 @@ async def _run_tmux_command(
 
     Args:
         args: Command arguments (without 'tmux' prefix)
-        capture_output: Whether to capture stdout/stderr
-        check: Whether to raise exception on non-zero exit code
+        capture_output: Whether to capture stdout (stderr is captured only with check)
+        check: Whether to log stderr on non-zero exit code
 
     Returns:
         Tuple of (returncode, stdout, stderr)
@@ -34,10 +34,11 @@ async def _run_tmux_command(
 
     try:
         if capture_output:
+            # stderrはエラーログ出力時のみ読むため、それ以外はパイプを作らない
             result = await asyncio.create_subprocess_exec(
                 *cmd,
                 stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE if check else asyncio.subprocess.DEVNULL,
             )
             stdout, stderr = await result.communicate()
             returncode = result.returncode
@@ -5,9 +5,974 @@ Pattern-based trigger system for push-tmux
 
 import re
 import click
+from collections import deque
+import functools
+import json
+import string
+import sys
+import time
 import logging
-from typing import Dict, Any, Optional, Tuple, List
-from datetime import datetime, timedelta
+from typing import (
+    Dict,
+    Any,
+    Optional,
+    Tuple,
+    List,
+    Callable,
+    Collection,
+    Deque,
+    Iterable,
+    NamedTuple,
+    Union,
+)
+from datetime import datetime
+
+try:
+    import re2
+except ImportError:
+    re2 = None
+else:
+    # Other modules named re2 (e.g. the old pyre2) lack the Options API
+    if not hasattr(re2, "Options"):
+        re2 = None
+
+
+class _Transform(NamedTuple):
+    """A transform parsed once at trigger construction"""
+
+    fn: Callable[[str, Optional[re.Pattern], Tuple[Any, ...], Dict[str, Any]], str]
+    regex: Optional[re.Pattern]
+    args: Tuple[Any, ...]
+    source: str
+    keeps_empty: bool = False  # Always maps "" to "", so it can be skipped
+
+
+def _resolve_arg(arg: Union[int, str], variables: Dict[str, Any]) -> int:
+    """Resolve an argument that might be a number or variable"""
+    if type(arg) is int:
+        return arg  # Pre-resolved when the transform was parsed
+    arg = arg.strip()
+
+    # Try as integer
+    try:
+        return int(arg)
+    except ValueError:
+        pass
+
+    # Try as variable reference
+    if arg in variables:
+        try:
+            return int(variables[arg])
+        except (ValueError, TypeError):
+            pass
+
+    return 0
+
+
+def _expand_value(value: str, variables: Dict[str, Any]) -> str:
+    """Expand variables in a regex_match result value, keeping it on failure"""
+    if "{" not in value:
+        return value
+    try:
+        return value.format_map(variables)
+    except (KeyError, ValueError):
+        return value
+
+
+def _transform_substr(value, regex, args, variables):
+    """substr(start, length) or substr(start)"""
+    start = _resolve_arg(args[0], variables)
+    if len(args) >= 2:
+        length = _resolve_arg(args[1], variables)
+        return value[start : start + length]
+    return value[start:]
+
+
+def _transform_lower(value, regex, args, variables):
+    """lower()"""
+    return value.lower()
+
+
+def _transform_upper(value, regex, args, variables):
+    """upper()"""
+    return value.upper()
+
+
+def _transform_replace(value, regex, args, variables):
+    """replace(old, new)"""
+    if len(args) >= 2:
+        return value.replace(args[0], args[1])
+    return value
+
+
+def _transform_prefix(value, regex, args, variables):
+    """prefix(string)"""
+    return args[0] + value
+
+
+def _transform_suffix(value, regex, args, variables):
+    """suffix(string)"""
+    return value + args[0]
+
+
+def _transform_truncate(value, regex, args, variables):
+    """truncate(length)"""
+    return value[: _resolve_arg(args[0], variables)]
+
+
+def _transform_regex_extract(value, regex, args, variables):
+    """regex_extract(pattern, group_num=0)"""
+    if regex is None:
+        return value
+    group_num = int(args[1]) if len(args) > 1 else 0
+    match = regex.search(value)
+    if match:
+        try:
+            return match.group(group_num)
+        except IndexError:
+            return match.group(0)
+    return value  # Return original if no match
+
+
+def _transform_regex_replace(value, regex, args, variables):
+    """regex_replace(pattern, replacement)"""
+    if regex is not None and len(args) >= 3:
+        return regex.sub(args[2], value)
+    return value
+
+
+_DIGITS = frozenset("0123456789")
+
+
+def _compile_replacement(regex: re.Pattern, replacement: str):
+    """
+    Turn a regex_replace replacement into a ``Pattern.sub`` argument once
+
+    Replacements made only of literal text, ``\\N`` and ``\\g<...>`` group
+    references become a callable over pre-split segments, so the template
+    is not re-parsed on every substitution. Anything else (escape sequences,
+    octal escapes, invalid references) is returned unchanged for ``re`` to
+    handle.
+    """
+    if "\\" not in replacement:
+        return replacement
+
+    segments: List[Tuple[bool, Any]] = []
+    literal: List[str] = []
+    i = 0
+    while i < len(replacement):
+        char = replacement[i]
+        if char != "\\":
+            literal.append(char)
+            i += 1
+            continue
+
+        group: Any = None
+        if replacement[i + 1 : i + 2] in _DIGITS:
+            end = i + 1
+            while end < len(replacement) and replacement[end] in _DIGITS:
+                end += 1
+            digits = replacement[i + 1 : end]
+            if len(digits) <= 2 and digits[0] != "0":
+                group = int(digits)
+                i = end
+        elif replacement.startswith("\\g<", i) and ">" in replacement[i:]:
+            end = replacement.index(">", i)
+            name = replacement[i + 3 : end]
+            if name and all(c in _DIGITS for c in name):
+                group = int(name)
+            elif name.isidentifier():
+                group = regex.groupindex.get(name)
+            i = end + 1
+
+        if group is None or (isinstance(group, int) and group > regex.groups):
+            return replacement
+        if literal:
+            segments.append((False, "".join(literal)))
+            literal = []
+        segments.append((True, group))
+    if literal:
+        segments.append((False, "".join(literal)))
+
+    parts = tuple(segments)
+
+    def expand(match: re.Match) -> str:
+        return "".join(
+            (match.group(value) or "") if is_group else value
+            for is_group, value in parts
+        )
+
+    return expand
+
+
+def _transform_regex_match(value, regex, args, variables):
+    """regex_match(pattern, true_value, false_value) or regex_match(pattern)"""
+    if regex is None:
+        return value
+    if len(args) >= 3:
+        # Expand variables in true/false values
+        true_val = _expand_value(args[1], variables)
+        false_val = _expand_value(args[2], variables)
+        return true_val if regex.search(value) else false_val
+    # Return original if matches, empty if not
+    return value if regex.search(value) else ""
+
+
+# Transform name -> implementation
+_TRANSFORM_TABLE = {
+    "substr": _transform_substr,
+    "lower": _transform_lower,
+    "upper": _transform_upper,
+    "replace": _transform_replace,
+    "prefix": _transform_prefix,
+    "suffix": _transform_suffix,
+    "truncate": _transform_truncate,
+    "regex_extract": _transform_regex_extract,
+    "regex_replace": _transform_regex_replace,
+    "regex_match": _transform_regex_match,
+}
+
+# Transforms whose first argument is a regular expression
+_REGEX_TRANSFORMS = ("regex_extract", "regex_replace", "regex_match")
+
+
+def _parse_regex_args(
+    args_str: str, variables: Optional[Dict[str, Any]] = None
+) -> List[str]:
+    """
+    Parse arguments for regex functions in a single pass
+
+    Commas only separate arguments at nesting depth 0, so commas inside
+    groups, character classes and quantifiers such as ``{1,3}`` stay part
+    of the pattern. Escaped characters and quoted text are never split.
+    """
+    args = []
+    current_arg = []
+    in_quotes = False
+    in_class = False
+    depth = 0
+    escape_next = False
+    has_comma = False
+
+    for char in args_str:
+        if escape_next:
+            current_arg.append(char)
+            escape_next = False
+        elif char == "\\":
+            escape_next = True
+            current_arg.append(char)  # Keep backslash for regex
+        elif char in ('"', "'"):
+            in_quotes = not in_quotes
+        elif in_quotes:
+            current_arg.append(char)
+        elif in_class:
+            in_class = char != "]"
+            current_arg.append(char)
+        elif char == "," and depth == 0:
+            args.append("".join(current_arg).strip().strip("\"'"))
+            current_arg = []
+            has_comma = True
+        else:
+            if char == "[":
+                in_class = True
+            elif char in "({":
+                depth += 1
+            elif char in ")}" and depth > 0:
+                depth -= 1
+            current_arg.append(char)
+
+    # Add the last argument
+    if current_arg or has_comma:
+        args.append("".join(current_arg).strip().strip("\"'"))
+
+    return args
+
+
+# Regex metacharacters that end a literal prefix
+_REGEX_METACHARS = frozenset(".^$*+?{}[]|()\\")
+
+# Non-ASCII characters that IGNORECASE matches to an ASCII letter but
+# str.lower() does not map to it
+_CASE_FOLD_FIXUPS = str.maketrans({"\u0130": "i", "\u0131": "i", "\u017f": "s"})
+
+
+def _literal_prefix(pattern: str, case_sensitive: bool) -> str:
+    """
+    Extract a literal prefix that every match of the pattern must contain
+
+    Returns an empty string when no safe prefix can be derived.
+    """
+    # Alternation and inline flags can make the prefix optional
+    if "|" in pattern or "(?" in pattern:
+        return ""
+
+    start = 1 if pattern.startswith("^") else 0
+    end = start
+    while end < len(pattern) and pattern[end] not in _REGEX_METACHARS:
+        end += 1
+
+    prefix = pattern[start:end]
+    # A following quantifier may make the last character optional
+    if end < len(pattern) and pattern[end] in "*?{":
+        prefix = prefix[:-1]
+
+    if case_sensitive:
+        return prefix
+    # Case-insensitive prefixes are compared against a folded message
+    return prefix.lower() if prefix.isascii() else ""
+
+
+def _alternation_literals(pattern: str, case_sensitive: bool) -> Tuple[str, ...]:
+    """
+    Split a pattern made only of literal alternatives, e.g. ``ERROR|WARNING``
+
+    Every match contains at least one of the returned literals. Returns an
+    empty tuple for any other pattern.
+    """
+    if "|" not in pattern or _REGEX_METACHARS.difference("|").intersection(pattern):
+        return ()
+
+    branches = pattern.split("|")
+    # An empty branch matches anywhere
+    if not all(branches):
+        return ()
+    if case_sensitive:
+        return tuple(branches)
+    if not pattern.isascii():
+        return ()
+    return tuple(branch.lower() for branch in branches)
+
+
+def _fold_case(message: str) -> str:
+    """Lowercase a message for case-insensitive literal prefiltering"""
+    if message.isascii():
+        return message.lower()
+    return message.translate(_CASE_FOLD_FIXUPS).lower()
+
+
+@functools.lru_cache(maxsize=1024)
+def _compile_regex(pattern: str, flags: int = 0) -> re.Pattern:
+    """
+    Compile a user-supplied regex through a process-wide cache
+
+    re keeps only the most recent 512 patterns, so configs with many
+    triggers and transforms could evict each other on reload. Errors are
+    not cached and propagate as re.error.
+    """
+    return re.compile(pattern, flags)
+
+
+def _compile_match_pattern(
+    pattern: Optional[str], use_regex: bool, case_sensitive: bool
+) -> Optional[re.Pattern]:
+    """Compile the match pattern of a trigger (None if not a valid regex)"""
+    if not pattern or not use_regex:
+        return None
+
+    flags = 0 if case_sensitive else re.IGNORECASE
+    try:
+        return _compile_regex(pattern, flags)
+    except re.error:
+        click.echo(f"Invalid regex pattern in trigger: {pattern}", err=True)
+        return None
+
+
+# Escapes whose meaning differs between re and RE2 on non-ASCII text
+_RE2_ASCII_ONLY_ESCAPES = frozenset("wWdDbB")
+
+
+def _compile_re2_pattern(
+    pattern: str, case_sensitive: bool
+) -> Tuple[Optional[Any], bool]:
+    """
+    Compile a trigger pattern with RE2 when it matches exactly like ``re``
+
+    RE2 runs in linear time, so user patterns such as ``(?:a+)+b`` cannot
+    stall the message loop. Patterns using features RE2 rejects (backrefs,
+    lookarounds) or constructs it interprets differently (``\\s``, ``$``,
+    POSIX classes, ``{,n}``, captures inside a repeated group) stay on
+    ``re``.
+
+    Returns:
+        (compiled RE2 pattern or None, whether it is only valid for ASCII
+        messages)
+    """
+    if re2 is None or "$" in pattern or "[:" in pattern or "{," in pattern:
+        return None, False
+    # RE2 does not fold characters such as "ı" or "İ" to ASCII letters
+    if not case_sensitive and not pattern.isascii():
+        return None, False
+
+    # \w, \d, \b and case folding only agree with re on ASCII text
+    ascii_only = not case_sensitive
+    escaped = False
+    class_start = -1  # Index of the "[" of the open character class
+    # Per open group: whether it is, or contains, a capturing group
+    groups: List[bool] = []
+    for index, char in enumerate(pattern):
+        if escaped:
+            if char in "sS":
+                return None, False
+            if char in _RE2_ASCII_ONLY_ESCAPES:
+                ascii_only = True
+            escaped = False
+        elif char == "\\":
+            escaped = True
+        elif class_start >= 0:
+            # A "]" right after "[" or "[^" is a literal member
+            if char == "]" and index - class_start > (
+                2 if pattern.startswith("[^", class_start) else 1
+            ):
+                class_start = -1
+        elif char == "[":
+            class_start = index
+        elif char == "(":
+            groups.append(
+                not pattern.startswith("(?", index)
+                or pattern.startswith("(?P<", index)
+            )
+        elif char == ")":
+            captures = groups.pop() if groups else True
+            # When a repeated group's last iteration matches empty, re and
+            # RE2 report different captures: (a*)*b on "aab" gives "" vs "aa"
+            if captures and pattern[index + 1 : index + 2] in ("*", "+", "?", "{"):
+                return None, False
+            if groups:
+                groups[-1] = groups[-1] or captures
+
+    options = re2.Options()
+    options.case_sensitive = case_sensitive
+    options.log_errors = False
+    try:
+        return re2.compile(pattern, options), ascii_only
+    except re2.error:
+        return None, False
+
+
+# Transforms that always return "" for an empty value
+_EMPTY_PRESERVING_TRANSFORMS = frozenset(
+    ("substr", "lower", "upper", "truncate", "regex_extract")
+)
+
+
+def _keeps_empty(
+    func_name: str, regex: Optional[re.Pattern], args: Tuple[Any, ...]
+) -> bool:
+    """Check whether a parsed transform always maps an empty value to itself"""
+    if func_name in _EMPTY_PRESERVING_TRANSFORMS:
+        return True
+    if func_name == "replace":
+        # "".replace("", new) inserts new
+        return bool(args and args[0])
+    if func_name == "regex_replace":
+        return regex is not None and regex.search("") is None
+    if func_name == "regex_match":
+        # The two-argument form returns the value itself or ""
+        return len(args) < 3
+    return False
+
+
+def _int_or_name(arg: str) -> Union[int, str]:
+    """Convert a numeric transform argument to int, leaving variable names"""
+    arg = arg.strip()
+    try:
+        return int(arg)
+    except ValueError:
+        return arg
+
+
+# "func(args)" - args run to the last closing parenthesis
+_TRANSFORM_CALL_RE = re.compile(r"\s*(\w+)\s*\((.*)\)", re.DOTALL)
+
+
+def _parse_transform(transform: str) -> Optional[_Transform]:
+    """
+    Parse a transform string like ``func(args)`` once
+
+    Returns:
+        Parsed transform, or None for invalid syntax or unknown functions
+    """
+    # Parse function call format: func(args)
+    parsed = _TRANSFORM_CALL_RE.match(transform)
+    if parsed is None:
+        return None
+
+    func_name, args_str = parsed.group(1), parsed.group(2).strip()
+    fn = _TRANSFORM_TABLE.get(func_name)
+    if fn is None:
+        return None
+
+    regex = None
+    if func_name == "substr":
+        args = tuple(_int_or_name(arg) for arg in args_str.split(","))
+    elif func_name == "replace":
+        args = tuple(arg.strip().strip("\"'") for arg in args_str.split(",", 1))
+    elif func_name in ("prefix", "suffix"):
+        args = (args_str.strip("\"'"),)
+    elif func_name == "truncate":
+        args = (_int_or_name(args_str),)
+    elif func_name in _REGEX_TRANSFORMS:
+        args = tuple(_parse_regex_args(args_str))
+        if not args:
+            return None
+        try:
+            regex = _compile_regex(args[0])
+        except re.error as e:
+            click.echo(f"Error applying transform '{transform}': {e}", err=True)
+            return None
+        if func_name == "regex_replace" and len(args) >= 2:
+            args = args[:2] + (_compile_replacement(regex, args[1]),)
+    else:
+        args = ()
+
+    return _Transform(
+        fn, regex, args, transform, _keeps_empty(func_name, regex, args)
+    )
+
+
+def _transform_fused_replace(value, regex, args, variables):
+    """Several literal regex_replace transforms applied in one pass"""
+    return regex.sub(args[0], value)
+
+
+def _transform_literal_replace(value, regex, args, variables):
+    """A literal regex_replace applied with str.replace"""
+    return value.replace(args[0], args[1])
+
+
+def _unescape_literal(pattern: str) -> Optional[str]:
+    """Return the text a pattern matches if it is a literal (``\\.`` allowed)"""
+    literal = []
+    escaped = False
+    for char in pattern:
+        if escaped:
+            # Escaped punctuation matches itself, other escapes are classes
+            if char not in string.punctuation and char != " ":
+                return None
+            literal.append(char)
+            escaped = False
+        elif char == "\\":
+            escaped = True
+        elif char in _REGEX_METACHARS:
+            return None
+        else:
+            literal.append(char)
+    if escaped:
+        return None
+    return "".join(literal)
+
+
+def _literal_replacement(transform: _Transform) -> Optional[Tuple[str, str]]:
+    """Return (text, replacement) if a regex_replace is purely literal"""
+    if transform.fn is not _transform_regex_replace or len(transform.args) < 2:
+        return None
+    replacement = transform.args[1]
+    if "\\" in replacement:
+        return None
+    literal = _unescape_literal(transform.args[0])
+    if not literal:
+        return None
+    return literal, replacement
+
+
+def _overlaps(a: str, b: str) -> bool:
+    """Check whether occurrences of two strings can share characters"""
+    if a in b or b in a:
+        return True
+    return any(
+        a[-k:] == b[:k] or b[-k:] == a[:k] for k in range(1, min(len(a), len(b)))
+    )
+
+
+def _can_fuse(run: List[Tuple[str, str]], candidate: Tuple[str, str]) -> bool:
+    """
+    Check that appending a literal replacement to a run keeps sequential semantics
+
+    The new pattern must not overlap an earlier pattern (fused matching would
+    pick a different occurrence) or an earlier replacement (sequential
+    application could match text produced by that replacement).
+    """
+    pattern = candidate[0]
+    return not any(
+        _overlaps(prev_pattern, pattern) or _overlaps(prev_replacement, pattern)
+        for prev_pattern, prev_replacement in run
+    )
+
+
+def _fused_transform(run: List[Tuple[str, str]], sources: List[str]) -> _Transform:
+    """Build one transform applying a run of literal replacements in one pass"""
+    table = dict(run)
+    regex = _compile_regex("|".join(re.escape(pattern) for pattern, _ in run))
+    return _Transform(
+        _transform_fused_replace,
+        regex,
+        (lambda m: table[m.group(0)],),
+        ", ".join(sources),
+        keeps_empty=True,
+    )
+
+
+def _fuse_literal_replacements(
+    transforms: Tuple[_Transform, ...],
+) -> Tuple[_Transform, ...]:
+    """
+    Fuse consecutive literal regex_replace transforms into single passes
+
+    A literal replacement that cannot be fused is applied with str.replace.
+    """
+    fused: List[_Transform] = []
+    run: List[Tuple[str, str]] = []
+    run_transforms: List[_Transform] = []
+
+    def flush():
+        if len(run) > 1:
+            fused.append(_fused_transform(run, [t.source for t in run_transforms]))
+        elif run:
+            # A single literal replacement needs no regex engine at all
+            fused.append(
+                _Transform(
+                    _transform_literal_replace,
+                    None,
+                    run[0],
+                    run_transforms[0].source,
+                    keeps_empty=True,
+                )
+            )
+        run.clear()
+        run_transforms.clear()
+
+    for transform in transforms:
+        literal = _literal_replacement(transform)
+        if literal is None:
+            flush()
+            fused.append(transform)
+            continue
+        if not _can_fuse(run, literal):
+            flush()
+        run.append(literal)
+        run_transforms.append(transform)
+    flush()
+
+    return tuple(fused)
+
+
+def _compile_template(
+    template: Optional[str],
+) -> Optional[Tuple[Tuple[str, Optional[str]], ...]]:
+    """
+    Pre-parse a ``str.format`` template into (literal, field_name) segments
+
+    Returns None when the template uses anything beyond plain ``{name}``
+    fields (format specs, conversions, attribute or index access), in which
+    case callers fall back to ``str.format``.
+    """
+    if not isinstance(template, str):
+        return None
+    try:
+        parsed = list(string.Formatter().parse(template))
+    except ValueError:
+        return None
+
+    segments = []
+    for literal, field_name, format_spec, conversion in parsed:
+        if field_name is not None and (
+            not field_name.isidentifier() or format_spec or conversion
+        ):
+            return None
+        segments.append((literal, field_name))
+    return tuple(segments)
+
+
+def _render_template(
+    segments: Tuple[Tuple[str, Optional[str]], ...], variables: Dict[str, Any]
+) -> str:
+    """Render pre-parsed template segments (raises KeyError like str.format)"""
+    return "".join(
+        literal if field_name is None else literal + str(variables[field_name])
+        for literal, field_name in segments
+    )
+
+
+def _transform_slice(value, regex, args, variables):
+    """Consecutive substr/truncate transforms folded into one slice"""
+    return value[args[0] : args[1]]
+
+
+def _constant_slice(transform: _Transform) -> Optional[Tuple[int, Optional[int]]]:
+    """Return (start, length) for substr/truncate with non-negative literal args"""
+    if transform.fn is _transform_substr:
+        args = transform.args
+    elif transform.fn is _transform_truncate:
+        args = (0,) + transform.args
+    else:
+        return None
+    if len(args) > 2:
+        return None
+    # Variable references are resolved per message
+    if any(type(arg) is not int or arg < 0 for arg in args):
+        return None
+    return args[0], (args[1] if len(args) > 1 else None)
+
+
+def _fold_slices(transforms: Tuple[_Transform, ...]) -> Tuple[_Transform, ...]:
+    """
+    Fold runs of substr/truncate with literal arguments into a single slice
+
+    ``substr(0, 10)`` followed by ``truncate(4)`` becomes ``value[0:4]``, so
+    the intermediate strings are never built.
+    """
+    folded: List[_Transform] = []
+    lo, hi = 0, None
+    sources: List[str] = []
+
+    def flush():
+        if sources:
+            folded.append(
+                _Transform(
+                    _transform_slice, None, (lo, hi), ", ".join(sources), True
+                )
+            )
+            sources.clear()
+
+    for transform in transforms:
+        span = _constant_slice(transform)
+        if span is None:
+            flush()
+            lo, hi = 0, None
+            folded.append(transform)
+            continue
+        start, length = span
+        # Slicing value[lo:hi] again is the same as slicing value once
+        lo += start
+        if length is not None:
+            hi = lo + length if hi is None else min(lo + length, hi)
+        sources.append(transform.source)
+    flush()
+
+    return tuple(folded)
+
+
+class _LiteralMatch:
+    """Match object for triggers whose pattern is a plain literal"""
+
+    __slots__ = ("_text",)
+
+    def __init__(self, text: str):
+        self._text = text
+
+    def group(self, index: int = 0) -> str:
+        if index != 0:
+            raise IndexError("no such group")
+        return self._text
+
+    def groups(self) -> Tuple[()]:
+        return ()
+
+    def groupdict(self) -> Dict[str, str]:
+        return {}
+
+
+def _freeze_devices(from_devices: Any) -> Union[str, Tuple[str, ...]]:
+    """Turn from_devices into a hashable cache key component"""
+    if isinstance(from_devices, str):
+        return from_devices
+    return tuple(from_devices)
+
+
+def _device_filter(
+    from_devices: Union[str, Tuple[str, ...]],
+) -> Optional[Collection[str]]:
+    """Build the set of allowed source devices (None when unrestricted)"""
+    if not from_devices:
+        return None
+    if isinstance(from_devices, str):
+        return from_devices  # Legacy single string, matched as before
+    try:
+        return frozenset(from_devices)
+    except TypeError:
+        return from_devices  # Unhashable entries - keep linear membership
+
+
+def _scan_method(pattern: str, anchored: bool) -> str:
+    """
+    Choose how a match pattern is applied to a message
+
+    ``anchored`` triggers must match the whole message. A pattern starting
+    with ``^`` can only match at position 0, so ``match`` gives the same
+    result as ``search`` without trying every start position; alternations
+    are excluded because ``^`` may cover only their first branch.
+    """
+    if anchored:
+        return "fullmatch"
+    if pattern.startswith("^") and "|" not in pattern:
+        return "match"
+    return "search"
+
+
+class _CompiledTrigger(NamedTuple):
+    """Match regex, transforms and mapping table of a trigger, built once"""
+
+    match_re: Optional[re.Pattern]
+    re2_match: Optional[Any]  # Linear-time equivalent of match_re, if any
+    re2_ascii_only: bool  # re2_match is only used for ASCII messages
+    transforms: Tuple[_Transform, ...]
+    mapping: Optional[Dict[str, str]]  # None when the trigger has no mapping
+    literal: str  # Literal every match must contain ("" when unknown)
+    literal_only: bool  # The pattern is exactly that literal
+    needles: Tuple[str, ...]  # Literal alternatives, one of which must occur
+    scan: str  # Pattern method to run: "search", "match" or "fullmatch"
+    from_devices: Optional[Collection[str]]  # None when any device may match
+    ignore_case: bool
+    template_segments: Optional[Tuple[Tuple[str, Optional[str]], ...]]
+    target_segments: Optional[Tuple[Tuple[str, Optional[str]], ...]]
+
+
+@functools.lru_cache(maxsize=128)
+def _build_compiled_trigger(
+    pattern: Optional[str],
+    use_regex: bool,
+    case_sensitive: bool,
+    from_devices: Union[str, Tuple[str, ...]],
+    transforms: Tuple[str, ...],
+    mapping_items: Tuple[Tuple[str, str], ...],
+    template: str,
+    target_device: Optional[str],
+    anchored: bool = False,
+) -> _CompiledTrigger:
+    """Build the compiled form of a trigger, shared between equivalent configs"""
+    match_re = _compile_match_pattern(pattern, use_regex, case_sensitive)
+    re2_match, re2_ascii_only = (
+        _compile_re2_pattern(pattern, case_sensitive) if match_re else (None, False)
+    )
+    return _CompiledTrigger(
+        match_re=match_re,
+        re2_match=re2_match,
+        re2_ascii_only=re2_ascii_only,
+        transforms=_fold_slices(
+            _fuse_literal_replacements(
+                tuple(
+                    parsed
+                    for parsed in map(_parse_transform, transforms)
+                    if parsed is not None
+                )
+            )
+        ),
+        mapping={
+            sys.intern(key) if type(key) is str else key: value
+            for key, value in mapping_items
+        }
+        or None,
+        literal=_literal_prefix(pattern, case_sensitive) if match_re else "",
+        literal_only=bool(match_re)
+        and not _REGEX_METACHARS.intersection(pattern),
+        needles=_alternation_literals(pattern, case_sensitive) if match_re else (),
+        scan=_scan_method(pattern, anchored) if match_re else "search",
+        from_devices=_device_filter(from_devices),
+        ignore_case=not case_sensitive,
+        template_segments=_compile_template(template),
+        target_segments=_compile_template(target_device),
+    )
+
+
+def _compile_trigger(trigger_config: Dict[str, Any]) -> _CompiledTrigger:
+    """Compile a trigger config, reusing the cached result when possible"""
+    match_config = trigger_config.get("match", {})
+    action_config = trigger_config.get("action", {})
+    key = (
+        match_config.get("pattern"),
+        match_config.get("regex", True),
+        match_config.get("case_sensitive", False),
+        _freeze_devices(match_config.get("from_devices", [])),
+        tuple(action_config.get("transforms", [])),
+        tuple(action_config.get("mapping", {}).items()),
+        action_config.get("template", ""),
+        action_config.get("target_device"),
+        bool(match_config.get("anchored", False)),
+    )
+    try:
+        return _build_compiled_trigger(*key)
+    except TypeError:
+        # Unhashable values in the config - build without caching
+        return _build_compiled_trigger.__wrapped__(*key)
+
+
+# Inline flag groups that apply to the whole pattern, e.g. "(?i)"
+_GLOBAL_FLAGS_RE = re.compile(r"\(\?[aiLmsux-]+\)")
+
+
+def _scan_message(pattern: Any, scan: str, message: str) -> Optional[Any]:
+    """Run a compiled re or RE2 pattern with the given scan method"""
+    if scan == "search":
+        return pattern.search(message)
+    if scan == "match":
+        return pattern.match(message)
+    return pattern.fullmatch(message)
+
+
+def _combinable(pattern: str) -> bool:
+    """Check whether a pattern keeps its meaning inside a combined alternation"""
+    return not (
+        "(?P" in pattern  # Named groups may clash, (?P=name) refers to them
+        or re.search(r"\\[0-9]", pattern)  # Group numbers shift
+        or "(?(" in pattern  # Conditional group references shift as well
+        or _GLOBAL_FLAGS_RE.search(pattern)  # Only allowed at the start
+    )
+
+
+def _build_reject_filter(
+    triggers: Dict[str, Dict[str, Any]], compiled: Dict[str, _CompiledTrigger]
+) -> Tuple[Optional[Any], bool, frozenset]:
+    """
+    Combine trigger patterns into one alternation used to reject messages
+
+    When the combined pattern finds nothing, none of its member triggers
+    can match, so all of them are skipped after a single scan. Matches are
+    still taken from each trigger's own pattern.
+
+    Returns:
+        (combined pattern or None, whether it is only valid for ASCII
+        messages, names of the member triggers)
+    """
+    parts = []
+    names = []
+    ascii_only = False
+    for trigger_name, trigger_config in triggers.items():
+        trigger = compiled[trigger_name]
+        if trigger.match_re is None:
+            continue
+        # Keep the linear-time guarantee when RE2 is in use
+        if re2 is not None and trigger.re2_match is None:
+            continue
+        pattern = trigger_config["match"]["pattern"]
+        if not _combinable(pattern):
+            continue
+        parts.append(f"(?i:{pattern})" if trigger.ignore_case else f"(?:{pattern})")
+        names.append(trigger_name)
+        # RE2 only folds case like re for ASCII messages
+        ascii_only = (
+            ascii_only
+            or trigger.re2_ascii_only
+            or (trigger.ignore_case and not pattern.isascii())
+        )
+
+    if len(parts) < 2:
+        return None, False, frozenset()
+
+    combined_pattern = "|".join(parts)
+    if re2 is not None:
+        options = re2.Options()
+        options.log_errors = False
+        try:
+            combined = re2.compile(combined_pattern, options)
+        except re2.error:
+            return None, False, frozenset()
+        return combined, ascii_only, frozenset(names)
+
+    try:
+        combined = re.compile(combined_pattern)
+    except re.error:
+        return None, False, frozenset()
+    return combined, False, frozenset(names)
 
 
 class TriggerPattern:
@@ -16,13 +981,33 @@ class TriggerPattern:
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         self.triggers = self._load_triggers()
-        self.cooldowns = {}  # Track last execution times
-        self.execution_counts = {}  # Track execution counts per hour
+        # Monotonic time of the last execution, per trigger
+        self.cooldowns: Dict[str, float] = {}
+        # Monotonic execution times within the last hour, per rate-limited trigger
+        self.execution_history: Dict[str, Deque[float]] = {}
+        self._compiled = self._compile_triggers()
+        self._needs_folded_message = any(
+            (compiled.literal or compiled.needles) and compiled.ignore_case
+            for compiled in self._compiled.values()
+        )
+        (
+            self._reject_re,
+            self._reject_ascii_only,
+            self._reject_names,
+        ) = _build_reject_filter(self.triggers, self._compiled)
+        self._clock = (None, "", "")  # (second, date, time) of the last message
 
     def _load_triggers(self) -> Dict[str, Dict[str, Any]]:
         """Load trigger definitions from config"""
         return self.config.get("triggers", {})
 
+    def _compile_triggers(self) -> Dict[str, _CompiledTrigger]:
+        """Compile match patterns and transforms once per trigger"""
+        return {
+            trigger_name: _compile_trigger(trigger_config)
+            for trigger_name, trigger_config in self.triggers.items()
+        }
+
     def check_message(
         self, message: str, source_device: str
     ) -> List[Tuple[str, Dict[str, Any]]]:
@@ -36,61 +1021,163 @@ class TriggerPattern:
         Returns:
             List of (trigger_name, action_config) tuples for matched triggers
         """
-        matched_triggers = []
+        return self._check_message(message, source_device, self.triggers.items())
 
+    def check_messages(
+        self, messages: List[str], source_device: str
+    ) -> List[List[Tuple[str, Dict[str, Any]]]]:
+        """
+        Check a batch of messages against the trigger patterns
+
+        Triggers whose required literal does not occur anywhere in the batch
+        are dropped once up front instead of being rejected per message.
+        Messages are still matched one by one, so results, cooldowns and
+        rate limits are the same as calling check_message for each message.
+
+        Args:
+            messages: The incoming messages, in arrival order
+            source_device: The device that sent the messages
+
+        Returns:
+            Per-message lists of (trigger_name, action_config) tuples
+        """
+        buffer = "\n".join(messages)
+        folded_buffer = _fold_case(buffer) if self._needs_folded_message else buffer
+
+        candidates = []
         for trigger_name, trigger_config in self.triggers.items():
-            if self._match_trigger(message, source_device, trigger_config):
+            compiled = self._compiled[trigger_name]
+            haystack = folded_buffer if compiled.ignore_case else buffer
+            literal = compiled.literal
+            if literal and literal not in haystack:
+                continue
+            needles = compiled.needles
+            if needles and not any(needle in haystack for needle in needles):
+                continue
+            candidates.append((trigger_name, trigger_config))
+
+        return [
+            self._check_message(message, source_device, candidates)
+            for message in messages
+        ]
+
+    def _check_message(
+        self,
+        message: str,
+        source_device: str,
+        triggers: Iterable[Tuple[str, Dict[str, Any]]],
+    ) -> List[Tuple[str, Dict[str, Any]]]:
+        """Match a message against the given triggers and prepare actions"""
+        matched_triggers = []
+        folded_message = (
+            _fold_case(message) if self._needs_folded_message else message
+        )
+        reject_re = self._reject_re
+        rejected = False
+        if reject_re is not None and (
+            not self._reject_ascii_only or message.isascii()
+        ):
+            try:
+                rejected = reject_re.search(message) is None
+            except UnicodeEncodeError:
+                pass  # Lone surrogates: leave it to the member triggers
+
+        base_variables = None  # Shared by all triggers matching this message
+
+        for trigger_name, trigger_config in triggers:
+            if rejected and trigger_name in self._reject_names:
+                continue
+            compiled = self._compiled[trigger_name]
+            matched, match = self._match_trigger(
+                message, source_device, trigger_config, compiled, folded_message
+            )
+            if matched:
                 if self._check_conditions(trigger_name, trigger_config):
+                    if base_variables is None:
+                        base_variables = self._base_variables(message, source_device)
                     action = self._prepare_action(
-                        message, source_device, trigger_config
+                        base_variables, trigger_config, compiled, match
                     )
                     if action:
                         matched_triggers.append((trigger_name, action))
-                        self._update_execution_tracking(trigger_name)
+                        self._update_execution_tracking(trigger_name, trigger_config)
 
         return matched_triggers
 
     def _match_trigger(
-        self, message: str, source_device: str, trigger_config: Dict[str, Any]
-    ) -> bool:
-        """Check if message matches trigger pattern"""
+        self,
+        message: str,
+        source_device: str,
+        trigger_config: Dict[str, Any],
+        compiled: _CompiledTrigger,
+        folded_message: str,
+    ) -> Tuple[bool, Optional[re.Match]]:
+        """Check if message matches trigger pattern
+
+        Returns:
+            (matched, match_object) - match_object is None for simple string matching
+        """
         match_config = trigger_config.get("match", {})
 
         # Check pattern
         pattern = match_config.get("pattern")
         if not pattern:
-            return False
+            return False, None
 
         # Check device filter
-        from_devices = match_config.get("from_devices", [])
-        if from_devices and source_device not in from_devices:
-            return False
-
-        # Perform pattern matching
-        case_sensitive = match_config.get("case_sensitive", False)
-        flags = 0 if case_sensitive else re.IGNORECASE
+        from_devices = compiled.from_devices
+        if from_devices is not None and source_device not in from_devices:
+            return False, None
 
         if match_config.get("regex", True):
-            # Regular expression matching
-            try:
-                match = re.search(pattern, message, flags)
-                if match:
-                    # Store match groups for later use
-                    trigger_config["_match"] = match
-                    trigger_config["_match_groups"] = match.groups()
-                    trigger_config["_match_dict"] = match.groupdict()
-                    return True
-            except re.error:
-                click.echo(f"Invalid regex pattern in trigger: {pattern}", err=True)
-                return False
-        else:
-            # Simple string matching
-            if case_sensitive:
-                return pattern in message
-            else:
-                return pattern.lower() in message.lower()
-
-        return False
+            # Regular expression matching with the precompiled pattern
+            match_re = compiled.match_re
+            if match_re is None:
+                return False, None
+            # Cheap substring check before running the regex engine
+            literal = compiled.literal
+            if literal:
+                haystack = folded_message if compiled.ignore_case else message
+                if compiled.literal_only and (
+                    not compiled.ignore_case or message.isascii()
+                ):
+                    # The whole pattern is this literal: no regex needed
+                    if compiled.scan == "fullmatch":
+                        start = 0 if haystack == literal else -1
+                    else:
+                        start = haystack.find(literal)
+                    if start < 0:
+                        return False, None
+                    return True, _LiteralMatch(
+                        message[start : start + len(literal)]
+                    )
+                if literal not in haystack:
+                    return False, None
+            needles = compiled.needles
+            if needles and not any(
+                needle in (folded_message if compiled.ignore_case else message)
+                for needle in needles
+            ):
+                return False, None
+            re2_match = compiled.re2_match
+            if re2_match is not None and (
+                not compiled.re2_ascii_only or message.isascii()
+            ):
+                try:
+                    match = _scan_message(re2_match, compiled.scan, message)
+                    return match is not None, match
+                except UnicodeEncodeError:
+                    pass  # Lone surrogates cannot be passed to RE2 as UTF-8
+            match = _scan_message(match_re, compiled.scan, message)
+            return match is not None, match
+
+        # Simple string matching
+        if not match_config.get("case_sensitive", False):
+            pattern = pattern.lower()
+            message = message.lower()
+        if match_config.get("anchored", False):
+            return pattern == message, None
+        return pattern in message, None
 
     def _check_conditions(
         self, trigger_name: str, trigger_config: Dict[str, Any]
@@ -102,21 +1189,23 @@ class TriggerPattern:
         cooldown = conditions.get("cooldown", 0)
         if cooldown > 0:
             last_execution = self.cooldowns.get(trigger_name)
-            if last_execution and (datetime.now() - last_execution).total_seconds() < cooldown:
+            if (
+                last_execution is not None
+                and time.monotonic() - last_execution < cooldown
+            ):
                 return False
 
         # Check max executions per hour
         max_per_hour = conditions.get("max_per_hour", 0)
         if max_per_hour > 0:
-            current_hour = datetime.now().replace(minute=0, second=0, microsecond=0)
-            hour_key = f"{trigger_name}_{current_hour.isoformat()}"
-
-            # Clean old entries
-            self._clean_old_execution_counts()
-
-            count = self.execution_counts.get(hour_key, 0)
-            if count >= max_per_hour:
-                return False
+            history = self.execution_history.get(trigger_name)
+            if history:
+                # Drop executions that left the one-hour window
+                cutoff = time.monotonic() - 3600
+                while history and history[0] <= cutoff:
+                    history.popleft()
+                if len(history) >= max_per_hour:
+                    return False
 
         # Check execute_once
         if conditions.get("execute_once", False):
@@ -125,8 +1214,31 @@ class TriggerPattern:
 
         return True
 
+    def _base_variables(self, message: str, source_device: str) -> Dict[str, Any]:
+        """Build the template variables that do not depend on the trigger"""
+        now = datetime.now()
+        # date and time only change once per second, reuse their strings
+        second = now.replace(microsecond=0)
+        if second != self._clock[0]:
+            self._clock = (
+                second,
+                now.strftime("%Y-%m-%d"),
+                now.strftime("%H:%M:%S"),
+            )
+        return {
+            "message": message,
+            "source_device": source_device,
+            "timestamp": now.isoformat(),
+            "date": self._clock[1],
+            "time": self._clock[2],
+        }
+
     def _prepare_action(
-        self, message: str, source_device: str, trigger_config: Dict[str, Any]
+        self,
+        base_variables: Dict[str, Any],
+        trigger_config: Dict[str, Any],
+        compiled: _CompiledTrigger,
+        match: Optional[re.Match] = None,
     ) -> Optional[Dict[str, Any]]:
         """Prepare action configuration with expanded variables"""
         action_config = trigger_config.get("action", {})
@@ -134,32 +1246,29 @@ class TriggerPattern:
             return None
 
         # Prepare variables for template expansion
-        variables = {
-            "message": message,
-            "source_device": source_device,
-            "timestamp": datetime.now().isoformat(),
-            "date": datetime.now().strftime("%Y-%m-%d"),
-            "time": datetime.now().strftime("%H:%M:%S"),
-        }
+        variables = dict(base_variables)
 
         # Add regex match groups if available
-        if "_match" in trigger_config:
-            match = trigger_config["_match"]
+        if match is not None:
             variables["match"] = match.group(0)  # Full match
             variables["match_text"] = match.group(0)  # Alias
 
             # Named groups
-            if trigger_config.get("_match_dict"):
-                variables.update(trigger_config["_match_dict"])
+            variables.update(match.groupdict())
 
             # Numbered groups
-            for i, group in enumerate(trigger_config.get("_match_groups", [])):
+            for i, group in enumerate(match.groups()):
                 variables[f"group{i + 1}"] = group
 
         # Expand template
         template = action_config.get("template", "")
         try:
-            expanded_template = template.format(**variables)
+            if compiled.template_segments is not None:
+                expanded_template = _render_template(
+                    compiled.template_segments, variables
+                )
+            else:
+                expanded_template = template.format_map(variables)
         except KeyError as e:
             click.echo(f"Missing variable in template: {e}", err=True)
             return None
@@ -169,13 +1278,18 @@ class TriggerPattern:
         if target_device:
             # Expand variables in target device name
             try:
-                target_device = target_device.format(**variables)
+                if compiled.target_segments is not None:
+                    target_device = _render_template(
+                        compiled.target_segments, variables
+                    )
+                else:
+                    target_device = target_device.format_map(variables)
             except KeyError:
                 pass  # Keep original if expansion fails
 
             # Apply transformations
             target_device = self._apply_transformations(
-                target_device, action_config, variables
+                target_device, compiled, variables
             )
 
         return {
@@ -185,222 +1299,43 @@ class TriggerPattern:
         }
 
     def _apply_transformations(
-        self, value: str, action_config: Dict[str, Any], variables: Dict[str, Any]
+        self, value: str, compiled: _CompiledTrigger, variables: Dict[str, Any]
     ) -> str:
         """Apply transformations like mapping and string functions to a value"""
         if not value:
             return value
 
         # Apply mapping table if defined
-        mapping = action_config.get("mapping", {})
-        if mapping and value in mapping:
-            value = mapping[value]
-
-        # Apply string functions if defined
-        transforms = action_config.get("transforms", [])
-        for transform in transforms:
-            value = self._apply_string_function(value, transform, variables)
-
-        return value
-
-    def _apply_string_function(
-        self, value: str, transform: str, variables: Dict[str, Any]
-    ) -> str:
-        """Apply a string function transformation"""
-        try:
-            # Parse function call format: func(args)
-            if "(" not in transform or ")" not in transform:
-                return value
-
-            func_name = transform[: transform.index("(")].strip()
-            args_str = transform[
-                transform.index("(") + 1 : transform.rindex(")")
-            ].strip()
-
-            # Handle different functions
-            if func_name == "substr":
-                # substr(start, length) or substr(start)
-                args = [arg.strip() for arg in args_str.split(",")]
-                if len(args) >= 1:
-                    start = self._resolve_arg(args[0], variables)
-                    if len(args) >= 2:
-                        length = self._resolve_arg(args[1], variables)
-                        return value[start : start + length]
-                    else:
-                        return value[start:]
-
-            elif func_name == "lower":
-                return value.lower()
-
-            elif func_name == "upper":
-                return value.upper()
-
-            elif func_name == "replace":
-                # replace(old, new)
-                args = [arg.strip().strip("\"'") for arg in args_str.split(",", 1)]
-                if len(args) >= 2:
-                    return value.replace(args[0], args[1])
-
-            elif func_name == "prefix":
-                # prefix(string)
-                prefix_str = args_str.strip("\"'")
-                return prefix_str + value
-
-            elif func_name == "suffix":
-                # suffix(string)
-                suffix_str = args_str.strip("\"'")
-                return value + suffix_str
-
-            elif func_name == "truncate":
-                # truncate(length)
-                length = self._resolve_arg(args_str, variables)
-                return value[:length]
-
-            elif func_name == "regex_extract":
-                # regex_extract(pattern, group_num=0)
-                args = self._parse_regex_args(args_str)
-                if len(args) >= 1:
-                    pattern = args[0]
-                    group_num = int(args[1]) if len(args) > 1 else 0
-                    match = re.search(pattern, value)
-                    if match:
-                        try:
-                            return match.group(group_num)
-                        except IndexError:
-                            return match.group(0)
-                    return value  # Return original if no match
-
-            elif func_name == "regex_replace":
-                # regex_replace(pattern, replacement)
-                args = self._parse_regex_args(args_str)
-                if len(args) >= 2:
-                    pattern = args[0]
-                    replacement = args[1]
-                    return re.sub(pattern, replacement, value)
-
-            elif func_name == "regex_match":
-                # regex_match(pattern, true_value, false_value)
-                args = self._parse_regex_args(args_str)
-                if len(args) >= 3:
-                    pattern = args[0]
-                    true_val = args[1]
-                    false_val = args[2]
-
-                    # Expand variables in true/false values
-                    try:
-                        true_val = (
-                            true_val.format(**variables)
-                            if "{" in true_val
-                            else true_val
-                        )
-                    except (KeyError, ValueError):
-                        pass
-                    try:
-                        false_val = (
-                            false_val.format(**variables)
-                            if "{" in false_val
-                            else false_val
-                        )
-                    except (KeyError, ValueError):
-                        pass
-
-                    if re.search(pattern, value):
-                        return true_val
-                    else:
-                        return false_val
-                elif len(args) >= 1:
-                    # Return original if matches, empty if not
-                    pattern = args[0]
-                    if re.search(pattern, value):
-                        return value
-                    else:
-                        return ""
-
-        except Exception as e:
-            click.echo(f"Error applying transform '{transform}': {e}", err=True)
-
-        return value
-
-    def _parse_regex_args(
-        self, args_str: str, variables: Optional[Dict[str, Any]] = None
-    ) -> List[str]:
-        """Parse arguments for regex functions, handling escaped commas"""
-        args = []
-        current_arg = []
-        in_quotes = False
-        escape_next = False
-        has_comma = False
-
-        for char in args_str:
-            if escape_next:
-                current_arg.append(char)
-                escape_next = False
-            elif char == "\\":
-                escape_next = True
-                current_arg.append(char)  # Keep backslash for regex
-            elif char in ('"', "'"):
-                in_quotes = not in_quotes
-            elif char == "," and not in_quotes:
-                args.append("".join(current_arg).strip().strip("\"'"))
-                current_arg = []
-                has_comma = True
-            else:
-                current_arg.append(char)
-
-        # Add the last argument
-        if current_arg or has_comma:
-            args.append("".join(current_arg).strip().strip("\"'"))
-
-        return args
-
-    def _resolve_arg(self, arg: str, variables: Dict[str, Any]) -> int:
-        """Resolve an argument that might be a number or variable"""
-        arg = arg.strip()
-
-        # Try as integer
-        try:
-            return int(arg)
-        except ValueError:
-            pass
-
-        # Try as variable reference
-        if arg in variables:
+        mapping = compiled.mapping
+        if mapping is not None:
+            value = mapping.get(value, value)
+
+        # Apply precompiled string functions, inlined to avoid a method call
+        # per transform
+        for fn, regex, args, source, keeps_empty in compiled.transforms:
+            if not value and keeps_empty:
+                continue
             try:
-                return int(variables[arg])
-            except (ValueError, TypeError):
-                pass
+                value = fn(value, regex, args, variables)
+            except Exception as e:
+                click.echo(f"Error applying transform '{source}': {e}", err=True)
 
-        return 0
+        return value
 
-    def _update_execution_tracking(self, trigger_name: str):
+    def _update_execution_tracking(
+        self, trigger_name: str, trigger_config: Dict[str, Any]
+    ):
         """Update execution tracking for cooldown and rate limiting"""
+        now = time.monotonic()
         # Update cooldown
-        self.cooldowns[trigger_name] = datetime.now()
-
-        # Update hourly count
-        current_hour = datetime.now().replace(minute=0, second=0, microsecond=0)
-        hour_key = f"{trigger_name}_{current_hour.isoformat()}"
-        self.execution_counts[hour_key] = self.execution_counts.get(hour_key, 0) + 1
-
-    def _clean_old_execution_counts(self):
-        """Remove execution count entries older than 1 hour"""
-        current_hour = datetime.now().replace(minute=0, second=0, microsecond=0)
-        cutoff_time = current_hour - timedelta(hours=1)
-
-        keys_to_remove = []
-        for key in self.execution_counts:
-            # Extract timestamp from key
-            parts = key.rsplit("_", 1)
-            if len(parts) == 2:
-                try:
-                    timestamp = datetime.fromisoformat(parts[1])
-                    if timestamp < cutoff_time:
-                        keys_to_remove.append(key)
-                except ValueError:
-                    pass
+        self.cooldowns[trigger_name] = now
 
-        for key in keys_to_remove:
-            del self.execution_counts[key]
+        # Record the execution for the hourly rate limit
+        if trigger_config.get("conditions", {}).get("max_per_hour", 0) > 0:
+            history = self.execution_history.get(trigger_name)
+            if history is None:
+                history = self.execution_history[trigger_name] = deque()
+            history.append(now)
 
 
 async def process_trigger_actions(
@@ -440,5 +1375,20 @@ def check_triggers(
     Returns:
         List of matched trigger actions
     """
-    trigger_pattern = TriggerPattern(config)
-    return trigger_pattern.check_message(message, source_device)
+    try:
+        key = json.dumps(config.get("triggers", {}), sort_keys=True)
+    except (TypeError, ValueError):
+        # Values JSON cannot represent - use a one-off instance
+        return TriggerPattern(config).check_message(message, source_device)
+    return _get_trigger_pattern(key).check_message(message, source_device)
+
+
+@functools.lru_cache(maxsize=32)
+def _get_trigger_pattern(triggers_json: str) -> TriggerPattern:
+    """
+    Return the TriggerPattern for a JSON-encoded triggers table, built once
+
+    An edited config gets a fresh instance while repeated messages keep the
+    same one (and with it cooldown, rate-limit and execute-once state).
+    """
+    return TriggerPattern({"triggers": json.loads(triggers_json)})
@@ -35,12 +35,28 @@ def runner():
     return CliRunner()
 
 
-# モックされたAsyncioサブプロセス
+# モジュール内で共有するサブプロセスモック（テストごとにリセット）
+@pytest.fixture(scope="module")
+def _subprocess_recorder():
+    """create_subprocess_exec用のAsyncMockをモジュール単位で一度だけ生成"""
+    return AsyncMock()
+
+
+# tmux送信時の待機を省略
 @pytest.fixture
-def mock_subprocess():
+def no_sleep():
+    """push_tmux.tmux内のasyncio.sleepを即時に返すモックに置き換える"""
+    with patch("push_tmux.tmux.asyncio.sleep", new_callable=AsyncMock) as mock:
+        yield mock
+
+
+# モックされたAsyncioサブプロセス（偽のtmuxに対して実時間の待機は不要）
+@pytest.fixture
+def mock_subprocess(_subprocess_recorder, no_sleep):
     """asyncio.create_subprocess_execのモック"""
+    _subprocess_recorder.reset_mock(return_value=True, side_effect=True)
     with patch(
-        "push_tmux.tmux.asyncio.create_subprocess_exec", new_callable=AsyncMock
+        "push_tmux.tmux.asyncio.create_subprocess_exec", new=_subprocess_recorder
     ) as mock:
         yield mock
 
@@ -65,20 +81,6 @@ def mock_tmux_env():
         yield
 
 
-# サンプル設定フィクスチャ
-@pytest.fixture
-def sample_config():
-    """テスト用のサンプル設定"""
-    return {
-        "tmux": {
-            "target_session": "current",
-            "target_window": "first",
-            "target_pane": "first",
-        },
-        "daemon": {"enabled": False, "watch_files": [], "poll_interval": 1.0},
-    }
-
-
 # 一時的な隔離された環境でテストを実行
 @pytest.fixture
 def isolated_env(tmp_path):
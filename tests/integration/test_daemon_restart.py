@@ -6,6 +6,11 @@
 import sys
 import subprocess
 
+import pytest
+
+# 実プロセスを起動するため、PRチェック（-m "not integration"）では実行しない
+pytestmark = [pytest.mark.integration, pytest.mark.slow]
+
 
 class TestDaemonRestart:
     """デーモン再起動機能のテスト"""
@@ -43,8 +48,8 @@ if count == 3:
     sys.stdout.flush()
     raise Exception("テスト用の意図的なクラッシュ")
 
-# 2秒間動作して終了
-time.sleep(2)
+# 短時間動作して終了（起動と正常終了の確認に十分な長さ）
+time.sleep(0.1)
 print(f"[TEST] 正常終了 #{{count}}")
 """)
 
@@ -64,19 +69,3 @@ print(f"[TEST] 正常終了 #{{count}}")
         assert counter_file.exists()
         with open(counter_file) as f:
             assert f.read().strip() == "1"
-
-
-def test_summary():
-    """テストサマリーの表示"""
-    print("""
-デーモン再起動機能のテスト
-============================================================
-以下の機能をテストします:
-1. プロセスクラッシュ後の自動再起動
-2. 再起動回数のカウント
-3. 特定回数でのクラッシュシミュレーション
-============================================================
-
-実行コマンド:
-  pytest tests/integration/test_daemon_restart.py -v
-""")
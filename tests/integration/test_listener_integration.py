@@ -5,16 +5,8 @@
 
 import pytest
 import asyncio
-import os
 from unittest.mock import AsyncMock, patch
 
-# パスを追加
-import sys
-
-sys.path.insert(
-    0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-)
-
 try:
     from asyncpushbullet import AsyncPushbullet, LiveStreamListener
 
@@ -32,7 +24,6 @@ except ImportError:
 class TestListenerIntegration:
     """リスナーの統合テスト（PyPIパッケージに移行したため無効化）"""
 
-    @pytest.mark.asyncio
     async def test_basic_listener_lifecycle(self):
         """リスナーの基本的なライフサイクルをテスト"""
         api_key = "test_token_12345"
@@ -69,7 +60,6 @@ class TestListenerIntegration:
             # 接続が試みられたことを確認
             mock_connect.assert_called()
 
-    @pytest.mark.asyncio
     async def test_listener_message_handling(self):
         """メッセージハンドリングのテスト"""
         api_key = "test_token_12345"
@@ -116,7 +106,6 @@ class TestListenerIntegration:
                 # メッセージが処理されたか確認
                 assert len(received_messages) > 0
 
-    @pytest.mark.asyncio
     async def test_listener_reconnection(self):
         """再接続機能のテスト"""
         api_key = "test_token_12345"
@@ -148,20 +137,3 @@ class TestListenerIntegration:
 
             # 再接続が試みられたことを確認
             assert len(connection_attempts) >= 1
-
-
-def test_summary():
-    """テストサマリーの表示"""
-    print("""
-リスナー統合テスト
-============================================================
-以下の機能をテストします:
-1. リスナーのライフサイクル管理
-2. メッセージの受信と処理
-3. WebSocket接続の再接続機能
-4. エラーハンドリング
-============================================================
-
-実行コマンド:
-  pytest tests/integration/test_listener_integration.py -v
-""")
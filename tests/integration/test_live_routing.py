@@ -8,13 +8,6 @@ import asyncio
 import os
 from unittest.mock import AsyncMock, patch
 
-# パスを追加
-import sys
-
-sys.path.insert(
-    0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-)
-
 try:
     from asyncpushbullet import AsyncPushbullet
 except ImportError:
@@ -28,7 +21,6 @@ except ImportError:
 class TestLiveRouting:
     """ライブルーティング機能の統合テスト（PyPIパッケージに移行したため無効化）"""
 
-    @pytest.mark.asyncio
     async def test_auto_route_session_detection(self):
         """自動ルーティングでのセッション検出テスト"""
         # tmuxセッション一覧のモック
@@ -55,7 +47,6 @@ class TestLiveRouting:
             assert "project-b" in sessions
             assert "webapp" in sessions
 
-    @pytest.mark.asyncio
     async def test_device_to_session_mapping(self):
         """デバイスからセッションへのマッピングテスト"""
         device_mapping = {
@@ -71,7 +62,6 @@ class TestLiveRouting:
         # 存在しないデバイスの処理
         assert device_mapping.get("nonexistent") is None
 
-    @pytest.mark.asyncio
     async def test_message_routing_with_mock_pushbullet(self):
         """Pushbulletをモックしたメッセージルーティングテスト"""
         api_key = os.getenv("PUSHBULLET_TOKEN", "test_token")
@@ -115,20 +105,3 @@ class TestLiveRouting:
 
                 # push_noteが呼ばれたことを確認
                 assert mock_pb.push_note.call_count == 2
-
-
-def test_summary():
-    """テストサマリーの表示"""
-    print("""
-ライブルーティング統合テスト
-============================================================
-以下の機能をテストします:
-1. 自動ルーティングでのtmuxセッション検出
-2. デバイスからセッションへのマッピング
-3. Pushbullet経由のメッセージルーティング
-4. 複数デバイス/セッションの処理
-============================================================
-
-実行コマンド:
-  pytest tests/integration/test_live_routing.py -v
-""")
@@ -0,0 +1,64 @@
+"""
+実際のtmuxを使った統合テスト
+"""
+
+import asyncio
+import shutil
+import subprocess
+from unittest.mock import patch
+
+import pytest
+
+from push_tmux.tmux import (
+    _check_session_exists,
+    capture_pane,
+    get_all_sessions,
+    send_to_tmux,
+)
+
+SESSION_NAME = "push-tmux-integration"
+
+pytestmark = [
+    pytest.mark.integration,
+    pytest.mark.skipif(shutil.which("tmux") is None, reason="tmuxが見つかりません"),
+]
+
+
+@pytest.fixture
+def tmux_session():
+    """テスト用のtmuxセッションを作成し、終了後に削除する"""
+    subprocess.run(
+        ["tmux", "new-session", "-d", "-s", SESSION_NAME, "-x", "200", "-y", "50"],
+        check=True,
+    )
+    yield SESSION_NAME
+    subprocess.run(
+        ["tmux", "kill-session", "-t", SESSION_NAME],
+        check=False,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+class TestRealTmux:
+    """実際のtmuxサーバーに対するテスト"""
+
+    async def test_session_check(self, tmux_session):
+        """作成したセッションが検出されるか"""
+        assert await _check_session_exists(tmux_session)
+        assert not await _check_session_exists(f"{tmux_session}-missing")
+        assert tmux_session in await get_all_sessions()
+
+    async def test_send_and_capture(self, tmux_session):
+        """送信したメッセージがペインに表示されるか"""
+        config = {"tmux": {"default_target_session": tmux_session, "enter_delay": 0}}
+
+        with patch("push_tmux.tmux.click.echo"):
+            await send_to_tmux(config, "echo push-tmux-marker")
+
+        # tmuxがキー入力を処理するまで待機
+        await asyncio.sleep(0.5)
+
+        content = await capture_pane(tmux_session)
+        assert content is not None
+        assert "push-tmux-marker" in content
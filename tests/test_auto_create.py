@@ -3,7 +3,6 @@
 Auto device creation command tests
 """
 
-import pytest
 from unittest.mock import AsyncMock, Mock, patch
 from click.testing import CliRunner
 from push_tmux.commands.auto_create import auto_create
@@ -13,7 +12,6 @@ from push_tmux.tmux import get_all_sessions
 class TestGetAllSessions:
     """get_all_sessions function tests"""
 
-    @pytest.mark.asyncio
     async def test_get_all_sessions_success(self):
         """Test successful session retrieval"""
         with patch("push_tmux.tmux._run_tmux_command") as mock_run:
@@ -24,7 +22,6 @@ class TestGetAllSessions:
                 ["list-sessions", "-F", "#{session_name}"], capture_output=True
             )
 
-    @pytest.mark.asyncio
     async def test_get_all_sessions_empty(self):
         """Test empty session list"""
         with patch("push_tmux.tmux._run_tmux_command") as mock_run:
@@ -32,7 +29,6 @@ class TestGetAllSessions:
             sessions = await get_all_sessions()
             assert sessions == []
 
-    @pytest.mark.asyncio
     async def test_get_all_sessions_error(self):
         """Test error handling"""
         with patch("push_tmux.tmux._run_tmux_command") as mock_run:
@@ -5,14 +5,10 @@
 
 import asyncio
 import pytest
-import sys
 import os
 from unittest.mock import patch, AsyncMock
 import click.testing
 
-# プロジェクトのルートをパスに追加
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 from push_tmux import cli
 
 
@@ -85,7 +81,6 @@ class TestAutoRouteMode:
                         or "tmuxセッションなし" in result.output
                     )
 
-    @pytest.mark.asyncio
     async def test_auto_route_message_routing(self):
         """メッセージの自動ルーティング"""
 
@@ -156,7 +151,6 @@ class TestAutoRouteMode:
                     config, 'echo "Test auto-route"', device_name="push-tmux"
                 )
 
-    @pytest.mark.asyncio
     async def test_auto_route_skip_missing_session(self):
         """存在しないセッションへのメッセージをスキップ"""
 
@@ -227,7 +221,6 @@ class TestAutoRouteMode:
                         "[スキップ] non-existent: tmuxセッションが存在しません"
                     )
 
-    @pytest.mark.asyncio
     async def test_auto_route_multiple_sessions(self):
         """複数セッションへの同時ルーティング"""
 
@@ -310,19 +303,5 @@ class TestAutoRouteMode:
                 assert calls[1][1]["device_name"] == "1on1-ver2"
 
 
-def test_summary():
-    """テストサマリー"""
-    print("自動ルーティング機能のテスト")
-    print("=" * 60)
-    print("以下の機能をテストします:")
-    print("1. tmuxセッションの自動検出")
-    print("2. メッセージの自動ルーティング")
-    print("3. 存在しないセッションのスキップ")
-    print("4. 複数セッションへの同時ルーティング")
-    print("=" * 60)
-    print("\n実行コマンド:")
-    print("  pytest tests/test_auto_route.py -v")
-
-
 if __name__ == "__main__":
-    test_summary()
+    pytest.main([__file__, "-v"])
@@ -3,7 +3,6 @@
 Auto device sync command tests
 """
 
-import pytest
 from unittest.mock import AsyncMock, Mock, patch
 from click.testing import CliRunner
 from push_tmux.commands.auto_sync import auto_sync
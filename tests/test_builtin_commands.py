@@ -4,12 +4,7 @@ Tests for built-in slash commands
 """
 
 import pytest
-import asyncio
 from unittest.mock import patch, AsyncMock, MagicMock
-import sys
-import os
-
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from push_tmux.builtin_commands import (
     handle_capture_command,
@@ -21,7 +16,6 @@ from push_tmux.slash_commands import parse_slash_command
 class TestCaptureCommand:
     """Test /capture command functionality"""
 
-    @pytest.mark.asyncio
     async def test_capture_current_pane(self):
         """Test capturing current pane (no arguments)"""
         with patch("push_tmux.builtin_commands.capture_pane") as mock_capture:
@@ -54,7 +48,6 @@ class TestCaptureCommand:
                 assert "Captured" in call_args[0][0]  # Title
                 assert "Captured content" in call_args[0][1]  # Content
 
-    @pytest.mark.asyncio
     async def test_capture_specific_pane(self):
         """Test capturing specific pane (pts/3)"""
         with patch("push_tmux.builtin_commands.capture_pane") as mock_capture:
@@ -83,7 +76,6 @@ class TestCaptureCommand:
                 assert "pts/3" in call_args[0][0]  # Title includes pane spec
                 assert "Content from pts/3" in call_args[0][1]  # Content
 
-    @pytest.mark.asyncio
     async def test_capture_failure(self):
         """Test handling capture failure"""
         with patch("push_tmux.builtin_commands.capture_pane") as mock_capture:
@@ -101,7 +93,6 @@ class TestCaptureCommand:
             assert success is False
             assert error == "Failed to capture pane content"
 
-    @pytest.mark.asyncio
     async def test_capture_with_device_default_tty(self):
         """Test capturing using device's default tty"""
         with patch("push_tmux.builtin_commands.get_tracker") as mock_tracker_func:
@@ -140,7 +131,6 @@ class TestCaptureCommand:
                         # Should update the tracking
                         mock_tracker.set_device_tty.assert_called_with("test-device", "pts/5")
 
-    @pytest.mark.asyncio
     async def test_capture_truncation(self):
         """Test content truncation for long captures"""
         with patch("push_tmux.builtin_commands.capture_pane") as mock_capture:
@@ -174,7 +164,6 @@ class TestCaptureCommand:
 class TestExecuteBuiltinCommand:
     """Test built-in command execution"""
 
-    @pytest.mark.asyncio
     async def test_execute_capture_command(self):
         """Test executing /capture as a built-in command"""
         with patch("push_tmux.builtin_commands.handle_capture_command") as mock_handle:
@@ -195,7 +184,6 @@ class TestExecuteBuiltinCommand:
             assert error is None
             mock_handle.assert_called_once_with(args, config, api_key, source_device, "test-device")
 
-    @pytest.mark.asyncio
     async def test_execute_non_builtin_command(self):
         """Test that non-built-in commands return False"""
         command = "deploy"  # Not a built-in command
@@ -9,12 +9,8 @@ import tempfile
 import logging
 from unittest.mock import patch, MagicMock
 from click.testing import CliRunner
-import sys
 import toml
 
-# テストパス設定
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 from push_tmux import cli
 from push_tmux.config import load_config
 from push_tmux.logging import setup_logging, log_daemon_event
@@ -10,13 +10,12 @@ import os
 # パスはconftest.pyで設定済み
 
 from push_tmux.tmux import send_to_tmux
-from test_helpers import create_tmux_mock, assert_send_keys_called
+from tmux_helpers import create_tmux_mock, assert_send_keys_called
 
 
 class TestDeviceMapping:
     """デバイスマッピング機能のテスト"""
 
-    @pytest.mark.asyncio
     async def test_device_mapping_with_existing_session(self, mock_subprocess):
         """マッピングされたセッションが存在する場合（文字列形式）"""
         config = {"device_mapping": {"mobile-dev": "frontend"}}
@@ -31,7 +30,6 @@ class TestDeviceMapping:
         # send-keysコマンドが正しく実行されたことを確認
         assert_send_keys_called(mock_subprocess, "frontend:0.0", "test message")
 
-    @pytest.mark.asyncio
     async def test_device_mapping_with_detailed_format(self, mock_subprocess):
         """詳細なマッピング形式（セッション、ウィンドウ、ペイン指定）"""
         config = {
@@ -50,7 +48,6 @@ class TestDeviceMapping:
         # send-keysコマンドが正しく実行されたことを確認
         assert_send_keys_called(mock_subprocess, "backend:2.1", "test message")
 
-    @pytest.mark.asyncio
     async def test_device_mapping_with_first_defaults(self, mock_subprocess):
         """詳細形式でウィンドウ・ペインを省略（firstがデフォルト）"""
         config = {
@@ -74,7 +71,6 @@ class TestDeviceMapping:
         # send-keysコマンドが正しく実行されたことを確認
         assert_send_keys_called(mock_subprocess, "test-session:0.0", "test message")
 
-    @pytest.mark.asyncio
     async def test_device_mapping_with_missing_session(self, mock_subprocess):
         """マッピングされたセッションが存在しない場合"""
         config = {
@@ -102,7 +98,6 @@ class TestDeviceMapping:
         assert len(send_calls) == 2
         assert "fallback" in send_calls[0][0][3]
 
-    @pytest.mark.asyncio
     async def test_device_name_as_session_default(self, mock_subprocess):
         """use_device_name_as_sessionがtrueの場合（デフォルト）"""
         config = {"tmux": {"use_device_name_as_session": True}}
@@ -117,7 +112,6 @@ class TestDeviceMapping:
         # send-keysコマンドが正しく実行されたことを確認
         assert_send_keys_called(mock_subprocess, "project-a:0.0", "test message")
 
-    @pytest.mark.asyncio
     async def test_priority_explicit_config_over_mapping(self, mock_subprocess):
         """マッピングが最優先される"""
         config = {
@@ -137,7 +131,6 @@ class TestDeviceMapping:
         # mapped-sessionが使われることを確認（マッピングが優先）
         assert_send_keys_called(mock_subprocess, "mapped-session:0.0", "test message")
 
-    @pytest.mark.asyncio
     async def test_no_device_name_uses_current_session(self, mock_subprocess):
         """デバイス名なしの場合、現在のセッションを使用"""
         config = {}
@@ -157,7 +150,6 @@ class TestDeviceMapping:
         # current-sessionが使われる
         assert_send_keys_called(mock_subprocess, "current-session:0.0", "test message")
 
-    @pytest.mark.asyncio
     async def test_error_when_no_session_found(self, mock_subprocess):
         """セッションが見つからない場合のエラー処理"""
         config = {}
@@ -202,15 +194,5 @@ class TestDeviceMapping:
         assert len(send_calls) == 0
 
 
-def test_summary():
-    """テスト全体の概要を表示"""
-    print("\n=== Device Mapping Tests Summary ===")
-    print("✓ マッピングされたセッションへの送信")
-    print("✓ 詳細マッピング（window/pane指定）")
-    print("✓ デフォルト値の処理")
-    print("✓ フォールバック処理")
-    print("✓ エラーハンドリング")
-
-
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -5,13 +5,8 @@ Tests for device-tty tracking functionality
 
 import pytest
 import tempfile
-import json
-from pathlib import Path
-import sys
 import os
 
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 from push_tmux.device_tty_tracker import DeviceTtyTracker
 
 
@@ -26,14 +26,12 @@ class TestMainCLI:
         assert "start" in result.output
         assert "send" in result.output
 
-    def test_command_help(self, runner):
+    @pytest.mark.parametrize("cmd", ["device", "start", "send"])
+    def test_command_help(self, runner, cmd):
         """個別コマンドのヘルプ"""
-        commands = ["device", "start", "send"]
-
-        for cmd in commands:
-            result = runner.invoke(cli, [cmd, "--help"])
-            assert result.exit_code == 0
-            assert "Usage:" in result.output
+        result = runner.invoke(cli, [cmd, "--help"])
+        assert result.exit_code == 0
+        assert "Usage:" in result.output
 
 
 class TestDeviceCommands:
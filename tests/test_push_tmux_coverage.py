@@ -8,10 +8,6 @@ from unittest.mock import AsyncMock, MagicMock, patch, mock_open
 from click.testing import CliRunner
 import os
 
-import sys
-
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 from push_tmux import cli
 from push_tmux.config import load_config, save_config, get_device_name, CONFIG_FILE
 from push_tmux.tmux import send_to_tmux
@@ -67,64 +63,6 @@ class TestConfigFunctions:
 class TestSendToTmux:
     """send_to_tmux関数のテスト"""
 
-    @pytest.mark.asyncio
-    async def test_send_to_tmux_current_session(self):
-        """現在のセッションへの送信"""
-        config = {}
-        message = "test message"
-
-        with patch.dict(os.environ, {"TMUX": "/tmp/tmux-1000/default,12345,0"}):
-            mock_result = MagicMock()
-            mock_result.communicate = AsyncMock(return_value=(b"test_session\n", b""))
-
-            with patch(
-                "asyncio.create_subprocess_exec", new_callable=AsyncMock
-            ) as mock_exec:
-                mock_exec.return_value = mock_result
-                mock_exec.return_value.wait = AsyncMock()
-
-                await send_to_tmux(config, message)
-
-                # tmux display-messageが呼ばれた
-                assert any(
-                    "display-message" in str(call) for call in mock_exec.call_args_list
-                )
-
-    @pytest.mark.asyncio
-    async def test_send_to_tmux_specific_session(self):
-        """特定のセッションへの送信"""
-        from test_helpers import create_tmux_mock
-
-        config = {
-            "tmux": {
-                "default_target_session": "my_session",
-                "target_window": "1",
-                "target_pane": "0",
-            }
-        }
-        message = "test message"
-
-        with patch(
-            "push_tmux.tmux.asyncio.create_subprocess_exec", new_callable=AsyncMock
-        ) as mock_exec:
-            # my_sessionが存在するようにモック
-            mock_exec.side_effect = create_tmux_mock(existing_sessions=["my_session"])
-
-            await send_to_tmux(config, message)
-
-            # send-keysが呼ばれた
-            calls = mock_exec.call_args_list
-            send_keys_calls = [call for call in calls if "send-keys" in str(call)]
-            assert len(send_keys_calls) == 2  # メッセージとEnterキーで2回
-
-            # ターゲットが正しい
-            for call in send_keys_calls:
-                args = call[0]
-                if "send-keys" in args:
-                    target_idx = args.index("-t") + 1
-                    assert "my_session:1.0" in args[target_idx]
-
-    @pytest.mark.asyncio
     async def test_send_to_tmux_no_tmux_env(self):
         """TMUX環境変数がない場合"""
         config = {}
@@ -179,50 +117,38 @@ class TestSendCommand:
                 assert config["tmux"]["target_pane"] == "1"
 
 
-class TestRegisterCommand:
-    """registerコマンドの追加テスト"""
-
-    @pytest.fixture
-    def runner(self):
-        return CliRunner()
-
-    def test_register_with_exception(self, runner):
+class TestDeviceCommandErrors:
+    """device register / device list の例外処理テスト"""
+
+    @pytest.mark.parametrize(
+        "module, command, error, expected",
+        [
+            (
+                "register",
+                "register",
+                "Network error",
+                "デバイス登録中にエラーが発生しました",
+            ),
+            (
+                "list_devices",
+                "list",
+                "API error",
+                "デバイス一覧取得中にエラーが発生しました",
+            ),
+        ],
+    )
+    def test_command_with_exception(self, runner, module, command, error, expected):
         """例外が発生した場合"""
         with patch.dict(os.environ, {"PUSHBULLET_TOKEN": "test_token"}):
-            with patch("push_tmux.commands.register.AsyncPushbullet") as MockPB:
+            with patch(f"push_tmux.commands.{module}.AsyncPushbullet") as MockPB:
                 mock_pb = AsyncMock()
-                mock_pb.get_devices = MagicMock(side_effect=Exception("Network error"))
+                mock_pb.get_devices = MagicMock(side_effect=Exception(error))
                 mock_pb.__aenter__ = AsyncMock(return_value=mock_pb)
                 mock_pb.__aexit__ = AsyncMock()
                 MockPB.return_value = mock_pb
 
-                result = runner.invoke(
-                    cli, ["device", "register"]
-                )  # 新しいコマンド構造
+                result = runner.invoke(cli, ["device", command])
                 # エラーが発生しても正常終了する（例外をキャッチしてメッセージを出力するだけ）
                 assert result.exit_code == 0
-                assert "デバイス登録中にエラーが発生しました" in result.output
-                assert "Network error" in result.output
-
-
-class TestListDevicesCommand:
-    """list-devicesコマンドの追加テスト"""
-
-    @pytest.fixture
-    def runner(self):
-        return CliRunner()
-
-    def test_list_devices_with_exception(self, runner):
-        """例外が発生した場合"""
-        with patch.dict(os.environ, {"PUSHBULLET_TOKEN": "test_token"}):
-            with patch("push_tmux.commands.list_devices.AsyncPushbullet") as MockPB:
-                mock_pb = AsyncMock()
-                mock_pb.get_devices = MagicMock(side_effect=Exception("API error"))
-                mock_pb.__aenter__ = AsyncMock(return_value=mock_pb)
-                mock_pb.__aexit__ = AsyncMock()
-                MockPB.return_value = mock_pb
-
-                result = runner.invoke(cli, ["device", "list"])  # 新しいコマンド構造
-                assert result.exit_code == 0
-                assert "デバイス一覧取得中にエラーが発生しました" in result.output
-                assert "API error" in result.output
+                assert expected in result.output
+                assert error in result.output
@@ -4,10 +4,6 @@ Tests for slash command fallback functionality
 """
 
 from unittest.mock import patch
-import sys
-import os
-
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from push_tmux.slash_commands import expand_slash_command
 
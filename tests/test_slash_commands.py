@@ -5,10 +5,6 @@ Tests for slash command functionality
 
 import pytest
 from unittest.mock import patch
-import sys
-import os
-
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from push_tmux.slash_commands import (
     SlashCommandParser,
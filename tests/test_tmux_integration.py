@@ -3,19 +3,17 @@
 tmux統合テスト
 """
 
+import asyncio
 import os
 from unittest.mock import patch
 
-import pytest
-
-from push_tmux.tmux import send_to_tmux
-from test_helpers import create_tmux_mock, assert_send_keys_called
+from push_tmux.tmux import _run_tmux_command, send_to_tmux
+from tmux_helpers import create_tmux_mock, assert_send_keys_called
 
 
 class TestSendToTmux:
     """tmux送信機能のテスト"""
 
-    @pytest.mark.asyncio
     async def test_send_to_tmux_default_session(self, mock_subprocess, mock_tmux_env):
         """デフォルトセッション（環境変数から）への送信"""
         # 現在のセッションを使用
@@ -35,8 +33,7 @@ class TestSendToTmux:
         # 新しいヘルパー関数ではデフォルトのウィンドウ/ペインが0になる
         assert_send_keys_called(mock_subprocess, "test-session:0.0", "test message")
 
-    @pytest.mark.asyncio
-    async def test_send_to_tmux_custom_session(self, mock_subprocess):
+    async def test_send_to_tmux_custom_session(self, mock_subprocess, no_sleep):
         """カスタムセッションへの送信"""
         config = {
             "tmux": {
@@ -54,8 +51,9 @@ class TestSendToTmux:
 
         # カスタム設定が使われる
         assert_send_keys_called(mock_subprocess, "my-session:2.1", "custom message")
+        # メッセージとEnterの間で待機する（テストでは即時に返る）
+        no_sleep.assert_awaited_once_with(0.5)
 
-    @pytest.mark.asyncio
     async def test_send_to_tmux_command_not_found(self, mock_subprocess):
         """tmuxコマンドが見つからない場合"""
         # FileNotFoundErrorを発生させる
@@ -74,7 +72,6 @@ class TestSendToTmux:
             ]
             assert len(error_calls) > 0
 
-    @pytest.mark.asyncio
     async def test_send_to_tmux_generic_error(self, mock_subprocess):
         """一般的なエラーが発生した場合"""
         # Exceptionを発生させる
@@ -93,7 +90,6 @@ class TestSendToTmux:
             ]
             assert len(error_calls) > 0
 
-    @pytest.mark.asyncio
     async def test_send_to_tmux_special_characters(self, mock_subprocess):
         """特殊文字を含むメッセージの送信"""
         config = {"tmux": {"default_target_session": "test"}}
@@ -113,7 +109,6 @@ class TestSendToTmux:
         assert len(send_calls) == 2
         assert send_calls[0][0][4] == special_message
 
-    @pytest.mark.asyncio
     async def test_send_to_tmux_unicode(self, mock_subprocess):
         """Unicode文字を含むメッセージの送信"""
         config = {"tmux": {"default_target_session": "test"}}
@@ -133,7 +128,6 @@ class TestSendToTmux:
         assert len(send_calls) == 2
         assert send_calls[0][0][4] == unicode_message
 
-    @pytest.mark.asyncio
     async def test_send_to_tmux_empty_message(self, mock_subprocess):
         """空のメッセージの処理"""
         config = {"tmux": {"default_target_session": "test"}}
@@ -151,7 +145,6 @@ class TestSendToTmux:
         assert len(send_calls) == 2
         assert send_calls[0][0][4] == ""
 
-    @pytest.mark.asyncio
     async def test_send_to_tmux_with_defaults(self, mock_subprocess):
         """デフォルト設定での送信"""
         config = {"tmux": {"target_window": "first", "target_pane": "first"}}
@@ -167,3 +160,31 @@ class TestSendToTmux:
 
         # firstが0に解決される
         assert_send_keys_called(mock_subprocess, "current:0.0", "default message")
+
+
+class TestRunTmuxCommand:
+    """tmuxコマンド実行ヘルパーのテスト"""
+
+    async def test_capture_output_discards_stderr(self, mock_subprocess):
+        """出力取得時、checkなしではstderrのパイプを作らない"""
+        mock_subprocess.side_effect = create_tmux_mock(current_session="s")
+
+        await _run_tmux_command(
+            ["display-message", "-p", "#{session_name}"], capture_output=True
+        )
+
+        kwargs = mock_subprocess.call_args.kwargs
+        assert kwargs["stdout"] == asyncio.subprocess.PIPE
+        assert kwargs["stderr"] == asyncio.subprocess.DEVNULL
+
+    async def test_capture_output_with_check_keeps_stderr(self, mock_subprocess):
+        """checkありではエラーログ用にstderrを取得する"""
+        mock_subprocess.side_effect = create_tmux_mock(current_session="s")
+
+        await _run_tmux_command(
+            ["display-message", "-p", "#{session_name}"],
+            capture_output=True,
+            check=True,
+        )
+
+        assert mock_subprocess.call_args.kwargs["stderr"] == asyncio.subprocess.PIPE
@@ -4,61 +4,51 @@ tmuxセッションルーティングのテスト
 デバイス名と同じ名前のtmuxセッションにメッセージが送信されることを確認
 """
 
-import pytest
 import os
-from unittest.mock import patch, AsyncMock
+from unittest.mock import patch
 
 from push_tmux.tmux import send_to_tmux
-from test_helpers import create_tmux_mock, assert_send_keys_called
+from tmux_helpers import create_tmux_mock, assert_send_keys_called
 
 
 class TestTmuxSessionRouting:
     """tmuxセッションルーティングのテスト"""
 
-    @pytest.mark.asyncio
-    async def test_device_name_to_session_mapping(self):
+    async def test_device_name_to_session_mapping(self, mock_subprocess):
         """デバイス名がtmuxセッション名として使用されるか"""
         config = {}
         message = "test message"
         device_name = "push-tmux"
 
-        with patch(
-            "push_tmux.tmux.asyncio.create_subprocess_exec", new_callable=AsyncMock
-        ) as mock_exec:
-            # push-tmuxセッションが存在する
-            mock_exec.side_effect = create_tmux_mock(existing_sessions=["push-tmux"])
+        # push-tmuxセッションが存在する
+        mock_subprocess.side_effect = create_tmux_mock(existing_sessions=["push-tmux"])
 
-            with patch("push_tmux.tmux.click.echo"):
-                await send_to_tmux(config, message, device_name=device_name)
+        with patch("push_tmux.tmux.click.echo"):
+            await send_to_tmux(config, message, device_name=device_name)
 
-            # send-keysが正しいセッションに送信されたか確認
-            assert_send_keys_called(mock_exec, "push-tmux:0.0", message)
+        # send-keysが正しいセッションに送信されたか確認
+        assert_send_keys_called(mock_subprocess, "push-tmux:0.0", message)
 
-    @pytest.mark.asyncio
-    async def test_fallback_to_current_session(self):
+    async def test_fallback_to_current_session(self, mock_subprocess):
         """デバイス名のセッションが存在しない場合、現在のセッションにフォールバック"""
         config = {}
         message = "test message"
         device_name = "non-existent"
 
-        with patch(
-            "push_tmux.tmux.asyncio.create_subprocess_exec", new_callable=AsyncMock
-        ) as mock_exec:
-            # non-existentセッションは存在しないが、currentセッションは存在
-            mock_exec.side_effect = create_tmux_mock(
-                existing_sessions=[],  # non-existentは存在しない
-                current_session="current-session",
-            )
+        # non-existentセッションは存在しないが、currentセッションは存在
+        mock_subprocess.side_effect = create_tmux_mock(
+            existing_sessions=[],  # non-existentは存在しない
+            current_session="current-session",
+        )
 
-            with patch("push_tmux.tmux.click.echo"):
-                with patch.dict(os.environ, {"TMUX": "/tmp/tmux-1000/default,12345,0"}):
-                    await send_to_tmux(config, message, device_name=device_name)
+        with patch("push_tmux.tmux.click.echo"):
+            with patch.dict(os.environ, {"TMUX": "/tmp/tmux-1000/default,12345,0"}):
+                await send_to_tmux(config, message, device_name=device_name)
 
-            # 現在のセッションが使われる
-            assert_send_keys_called(mock_exec, "current-session:0.0", message)
+        # 現在のセッションが使われる
+        assert_send_keys_called(mock_subprocess, "current-session:0.0", message)
 
-    @pytest.mark.asyncio
-    async def test_config_override(self):
+    async def test_config_override(self, mock_subprocess):
         """設定ファイルでセッションが指定されている場合"""
         config = {
             "tmux": {
@@ -70,56 +60,72 @@ class TestTmuxSessionRouting:
         message = "test message"
         device_name = "device"
 
-        with patch(
-            "push_tmux.tmux.asyncio.create_subprocess_exec", new_callable=AsyncMock
-        ) as mock_exec:
-            # specified-sessionが存在する
-            mock_exec.side_effect = create_tmux_mock(
-                existing_sessions=["specified-session"]
-            )
+        # specified-sessionが存在する
+        mock_subprocess.side_effect = create_tmux_mock(
+            existing_sessions=["specified-session"]
+        )
 
-            with patch("push_tmux.tmux.click.echo"):
-                await send_to_tmux(config, message, device_name=device_name)
+        with patch("push_tmux.tmux.click.echo"):
+            await send_to_tmux(config, message, device_name=device_name)
+
+        # 設定で指定されたセッションが使われる
+        assert_send_keys_called(mock_subprocess, "specified-session:1.2", message)
+
+        # 明示されたセッションも存在確認を行う
+        has_session_targets = [
+            call.args[3]
+            for call in mock_subprocess.call_args_list
+            if "has-session" in call.args
+        ]
+        assert has_session_targets == [device_name, "specified-session"]
 
-            # 設定で指定されたセッションが使われる
-            assert_send_keys_called(mock_exec, "specified-session:1.2", message)
+    async def test_stale_default_session_falls_back(self, mock_subprocess):
+        """設定のセッションが存在しない場合、現在のセッションにフォールバック"""
+        config = {"tmux": {"default_target_session": "stale-session"}}
+        message = "test message"
+
+        # stale-sessionは存在しない
+        mock_subprocess.side_effect = create_tmux_mock(
+            existing_sessions=[], current_session="current-session"
+        )
+
+        with patch("push_tmux.tmux.click.echo"):
+            with patch.dict(os.environ, {"TMUX": "/tmp/tmux-1000/default,12345,0"}):
+                await send_to_tmux(config, message, device_name="device")
 
-    @pytest.mark.asyncio
-    async def test_no_device_name(self):
+        # 現在のセッションが使われる
+        assert_send_keys_called(mock_subprocess, "current-session:0.0", message)
+
+    async def test_no_device_name(self, mock_subprocess):
         """デバイス名が指定されていない場合"""
         config = {}
         message = "test message"
 
-        with patch(
-            "push_tmux.tmux.asyncio.create_subprocess_exec", new_callable=AsyncMock
-        ) as mock_exec:
-            # 現在のセッションを使用
-            mock_exec.side_effect = create_tmux_mock(current_session="default-session")
+        # 現在のセッションを使用
+        mock_subprocess.side_effect = create_tmux_mock(
+            current_session="default-session"
+        )
 
-            with patch("push_tmux.tmux.click.echo"):
-                with patch.dict(os.environ, {"TMUX": "/tmp/tmux-1000/default,12345,0"}):
-                    await send_to_tmux(config, message)
+        with patch("push_tmux.tmux.click.echo"):
+            with patch.dict(os.environ, {"TMUX": "/tmp/tmux-1000/default,12345,0"}):
+                await send_to_tmux(config, message)
 
-            # 現在のセッションが使われる
-            assert_send_keys_called(mock_exec, "default-session:0.0", message)
+        # 現在のセッションが使われる
+        assert_send_keys_called(mock_subprocess, "default-session:0.0", message)
 
-    @pytest.mark.asyncio
-    async def test_multiple_sessions(self):
+    async def test_multiple_sessions(self, mock_subprocess):
         """複数のセッションが存在する場合、正しいセッションが選択される"""
         config = {}
         message = "test message"
         device_name = "target-session"
 
-        with patch(
-            "push_tmux.tmux.asyncio.create_subprocess_exec", new_callable=AsyncMock
-        ) as mock_exec:
-            # 複数のセッションが存在するが、target-sessionを使用
-            mock_exec.side_effect = create_tmux_mock(
-                existing_sessions=["session1", "session2", "target-session", "session3"]
-            )
+        # 複数のセッションが存在するが、target-sessionを使用
+        mock_subprocess.side_effect = create_tmux_mock(
+            existing_sessions=["session1", "session2", "target-session", "session3"]
+        )
 
-            with patch("push_tmux.tmux.click.echo"):
-                await send_to_tmux(config, message, device_name=device_name)
+        with patch("push_tmux.tmux.click.echo"):
+            await send_to_tmux(config, message, device_name=device_name)
 
-            # 指定されたセッションが使われる
-            assert_send_keys_called(mock_exec, "target-session:0.0", message)
+        # 指定されたセッションが使われる
+        assert_send_keys_called(mock_subprocess, "target-session:0.0", message)
@@ -4,10 +4,6 @@ Tests for regex transformation functions in triggers
 """
 
 import pytest
-import sys
-import os
-
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from push_tmux.triggers import TriggerPattern
 
@@ -139,6 +135,31 @@ class TestRegexReplace:
         # Swaps order: feature-123 -> 123_feature
         assert actions[0][1]["target_device"] == "123_feature"
 
+    def test_replace_with_named_and_unmatched_groups(self):
+        """Test named group references and optional groups that do not match"""
+        config = {
+            "triggers": {
+                "named_replace": {
+                    "match": {"pattern": "env (.+)"},
+                    "action": {
+                        "template": "deploy.sh",
+                        "target_device": "{group1}",
+                        "transforms": [
+                            "regex_replace((?P<name>[a-z]+)(-v)?, \\g<name>\\2_)"
+                        ],
+                    },
+                }
+            }
+        }
+
+        trigger = TriggerPattern(config)
+        actions = trigger.check_message("env app-v", "source")
+        assert actions[0][1]["target_device"] == "app-v_"
+
+        # Unmatched optional group expands to an empty string
+        actions = trigger.check_message("env app", "source")
+        assert actions[0][1]["target_device"] == "app_"
+
     def test_replace_special_chars(self):
         """Test replacing special characters"""
         config = {
@@ -187,6 +208,83 @@ class TestRegexReplace:
         # bugfix/issue-123 -> b_issue-123
         assert actions[0][1]["target_device"] == "b_issue-123"
 
+    def test_replace_multiple_literals_fused(self):
+        """Test independent literal replacements are fused into one pass"""
+        config = {
+            "triggers": {
+                "fused": {
+                    "match": {"pattern": "branch (.+)"},
+                    "action": {
+                        "template": "checkout.sh",
+                        "target_device": "{group1}",
+                        "transforms": [
+                            "regex_replace(feature/, f_)",
+                            "regex_replace(bugfix/, b_)",
+                            "regex_replace(hotfix/, h_)",
+                        ],
+                    },
+                }
+            }
+        }
+
+        trigger = TriggerPattern(config)
+        assert len(trigger._compiled["fused"].transforms) == 1
+
+        actions = trigger.check_message("branch hotfix/bugfix/feature/x", "source")
+        assert actions[0][1]["target_device"] == "h_b_f_x"
+
+    def test_replace_single_literal_without_regex(self):
+        """Test lone literal replacements (escaped punctuation too) skip re"""
+        config = {
+            "triggers": {
+                "literal": {
+                    "match": {"pattern": "version (.+)"},
+                    "action": {
+                        "template": "release.sh",
+                        "target_device": "{group1}",
+                        "transforms": [
+                            "regex_replace(\\., _)",
+                            "lower()",
+                            "regex_replace(-rc,)",
+                        ],
+                    },
+                }
+            }
+        }
+
+        trigger = TriggerPattern(config)
+        transforms = trigger._compiled["literal"].transforms
+        assert transforms[0].regex is None
+        assert transforms[2].regex is None
+
+        actions = trigger.check_message("version 1.2.3-RC", "source")
+        assert actions[0][1]["target_device"] == "1_2_3"
+
+    def test_replace_chained_literals_keep_order(self):
+        """Test replacements that feed into each other are applied in order"""
+        config = {
+            "triggers": {
+                "chained": {
+                    "match": {"pattern": "value (.+)"},
+                    "action": {
+                        "template": "echo",
+                        "target_device": "{group1}",
+                        "transforms": [
+                            "regex_replace(ab, x)",
+                            "regex_replace(xc, y)",
+                        ],
+                    },
+                }
+            }
+        }
+
+        trigger = TriggerPattern(config)
+        assert len(trigger._compiled["chained"].transforms) == 2
+
+        actions = trigger.check_message("value abc", "source")
+        # abc -> xc -> y
+        assert actions[0][1]["target_device"] == "y"
+
 
 class TestRegexMatch:
     """Test regex_match function for conditional values"""
@@ -243,6 +341,37 @@ class TestRegexMatch:
         actions = trigger.check_message("session test123", "source")
         assert actions[0][1]["target_device"] == ""
 
+    def test_empty_value_after_filter(self):
+        """Test transforms after a failed filter still apply when they add text"""
+        config = {
+            "triggers": {
+                "filter": {
+                    "match": {"pattern": "session (.+)"},
+                    "action": {
+                        "template": "echo",
+                        "target_device": "{group1}",
+                        "transforms": [
+                            "regex_match(^[a-z]+$)",
+                            "upper()",
+                            "regex_replace([0-9]+, N)",
+                            "replace(, x)",
+                            "regex_replace(^, s_)",
+                            "suffix(_fallback)",
+                        ],
+                    },
+                }
+            }
+        }
+
+        trigger = TriggerPattern(config)
+
+        actions = trigger.check_message("session test", "source")
+        assert actions[0][1]["target_device"] == "s_xTxExSxTx_fallback"
+
+        # Empty value skips transforms that keep "" but not the others
+        actions = trigger.check_message("session test123", "source")
+        assert actions[0][1]["target_device"] == "s_x_fallback"
+
 
 class TestComplexRegexChains:
     """Test complex chains of regex operations"""
@@ -370,6 +499,36 @@ class TestRegexEdgeCases:
         # C:\Users\test -> C:/Users/test
         assert actions[0][1]["target_device"] == "C:/Users/test"
 
+    def test_commas_inside_pattern(self):
+        """Test commas in quantifiers, classes and groups stay in the pattern"""
+        config = {
+            "triggers": {
+                "commas": {
+                    "match": {"pattern": "tag (.+)"},
+                    "action": {
+                        "template": "echo",
+                        "target_device": "{group1}",
+                        "transforms": [
+                            "regex_replace([,;]+, -)",
+                            "regex_extract(([a-z]{2,4})-(x|y,z)?, 1)",
+                            "regex_match(^[a-z]{1,3}$, short, long)",
+                        ],
+                    },
+                }
+            }
+        }
+
+        trigger = TriggerPattern(config)
+        assert [t.args[0] for t in trigger._compiled["commas"].transforms] == [
+            "[,;]+",
+            "([a-z]{2,4})-(x|y,z)?",
+            "^[a-z]{1,3}$",
+        ]
+
+        actions = trigger.check_message("tag abc,;def", "source")
+        # abc,;def -> abc-def -> abc -> short
+        assert actions[0][1]["target_device"] == "short"
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
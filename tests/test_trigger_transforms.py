@@ -4,10 +4,6 @@ Tests for trigger transformation features (mapping and string functions)
 """
 
 import pytest
-import sys
-import os
-
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from push_tmux.triggers import TriggerPattern
 
@@ -219,6 +215,58 @@ class TestStringFunctions:
         # PROD-SERVER-01 -> prod-server-01 -> prod_server_01 -> deploy_prod_server_01 -> deploy_prod_ser
         assert actions[0][1]["target_device"] == "deploy_prod_ser"
 
+    def test_substr_args_resolved_at_parse_time(self):
+        """Test numeric args are ints after parsing, names stay variables"""
+        config = {
+            "triggers": {
+                "tail": {
+                    "match": {"pattern": "tail (?P<n>\\d) (\\S+)"},
+                    "action": {
+                        "template": "tail.sh",
+                        "target_device": "{group2}",
+                        "transforms": ["substr(-6)", "truncate(n)"],
+                    },
+                }
+            }
+        }
+
+        trigger = TriggerPattern(config)
+        transforms = trigger._compiled["tail"].transforms
+        assert transforms[0].args == (-6,)
+        assert transforms[1].args == ("n",)
+
+        actions = trigger.check_message("tail 4 server-backup", "source")
+        # server-backup -> backup -> back
+        assert actions[0][1]["target_device"] == "back"
+
+    def test_consecutive_slices_folded(self):
+        """Test substr/truncate runs with literal args become one slice"""
+        config = {
+            "triggers": {
+                "slices": {
+                    "match": {"pattern": "host (\\S+)"},
+                    "action": {
+                        "template": "ssh.sh",
+                        "target_device": "{group1}",
+                        "transforms": [
+                            "substr(2, 10)",
+                            "truncate(6)",
+                            "substr(1)",
+                            "upper()",
+                            "truncate(3)",
+                        ],
+                    },
+                }
+            }
+        }
+
+        trigger = TriggerPattern(config)
+        assert len(trigger._compiled["slices"].transforms) == 3
+
+        actions = trigger.check_message("host web-server-01", "source")
+        # web-server-01 -> b-server-0 -> b-serv -> -serv -> -SERV -> -SE
+        assert actions[0][1]["target_device"] == "-SE"
+
 
 class TestCombinedFeatures:
     """Test combining mapping and transforms"""
@@ -280,6 +328,35 @@ class TestCombinedFeatures:
         # app_debug -> app_debug (no mapping) -> app_debug
         assert actions[0][1]["target_device"] == "app_debug"
 
+    def test_target_device_format_fallback(self):
+        """Test templates that need full str.format semantics and unknown fields"""
+        config = {
+            "triggers": {
+                "formatted": {
+                    "match": {"pattern": "job (\\w+)"},
+                    "action": {
+                        "template": "job.sh",
+                        "target_device": "{group1!r}-{missing}",
+                    },
+                },
+                "padded": {
+                    "match": {"pattern": "run (\\w+)"},
+                    "action": {
+                        "template": "run.sh",
+                        "target_device": "{group1:>6}",
+                    },
+                },
+            }
+        }
+
+        trigger = TriggerPattern(config)
+        actions = trigger.check_message("job build", "source")
+        # Unknown field -> keep the original template
+        assert actions[0][1]["target_device"] == "{group1!r}-{missing}"
+
+        actions = trigger.check_message("run ci", "source")
+        assert actions[0][1]["target_device"] == "    ci"
+
 
 class TestErrorHandling:
     """Test error handling in transformations"""
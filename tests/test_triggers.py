@@ -3,46 +3,104 @@
 Tests for pattern-based trigger functionality
 """
 
+import copy
+import json
 import pytest
-import time
-from unittest.mock import patch
-import sys
-import os
+import re
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+from push_tmux.triggers import (
+    TriggerPattern,
+    _alternation_literals,
+    _compile_re2_pattern,
+    _compile_regex,
+    _get_trigger_pattern,
+    _literal_prefix,
+    _scan_method,
+    check_triggers,
+    process_trigger_actions,
+)
+
+
+_FROZEN_NOW = datetime(2024, 1, 1, 12, 0, 0)
+
+
+@pytest.fixture(scope="module")
+def simple_trigger():
+    """Precompiled case-insensitive ERROR trigger shared across cases"""
+    return TriggerPattern(
+        {
+            "triggers": {
+                "error_trigger": {
+                    "match": {"pattern": "ERROR", "case_sensitive": False},
+                    "action": {"template": "handle_error.sh"},
+                }
+            }
+        }
+    )
 
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from push_tmux.triggers import TriggerPattern, check_triggers, process_trigger_actions
+@pytest.fixture(scope="module")
+def admin_trigger():
+    """Precompiled trigger restricted to admin devices"""
+    return TriggerPattern(
+        {
+            "triggers": {
+                "admin_trigger": {
+                    "match": {
+                        "pattern": "admin command",
+                        "from_devices": ["admin", "superuser"],
+                    },
+                    "action": {"template": "admin_action.sh"},
+                }
+            }
+        }
+    )
 
 
-class TestTriggerPattern:
-    """Test TriggerPattern class"""
-
-    def test_simple_pattern_match(self):
-        """Test simple pattern matching"""
-        config = {
+@pytest.fixture(scope="module")
+def _hourly_trigger():
+    return TriggerPattern(
+        {
             "triggers": {
-                "error_trigger": {
-                    "match": {"pattern": "ERROR", "case_sensitive": False},
-                    "action": {"template": "handle_error.sh"},
+                "hourly_limited": {
+                    "match": {"pattern": "alert"},
+                    "action": {"template": "alert.sh"},
+                    "conditions": {"max_per_hour": 2},
                 }
             }
         }
+    )
 
-        trigger = TriggerPattern(config)
 
-        # Should match
-        actions = trigger.check_message("ERROR: Something failed", "device1")
-        assert len(actions) == 1
-        assert actions[0][0] == "error_trigger"
-        assert actions[0][1]["command"] == "handle_error.sh"
+@pytest.fixture
+def hourly_trigger(_hourly_trigger):
+    """Shared max_per_hour trigger with its rate-limit state reset per case"""
+    yield _hourly_trigger
+    _hourly_trigger.cooldowns.clear()
+    _hourly_trigger.execution_history.clear()
 
-        # Case insensitive match
-        actions = trigger.check_message("error occurred", "device1")
-        assert len(actions) == 1
 
-        # No match
-        actions = trigger.check_message("All is well", "device1")
-        assert len(actions) == 0
+class TestTriggerPattern:
+    """Test TriggerPattern class"""
+
+    @pytest.mark.parametrize(
+        "message, device, expected",
+        [
+            ("ERROR: Something failed", "device1", 1),
+            # Case insensitive match
+            ("error occurred", "device1", 1),
+            ("All is well", "device1", 0),
+        ],
+    )
+    def test_simple_pattern_match(self, simple_trigger, message, device, expected):
+        """Test simple pattern matching"""
+        actions = simple_trigger.check_message(message, device)
+        assert len(actions) == expected
+        if expected:
+            assert actions[0][0] == "error_trigger"
+            assert actions[0][1]["command"] == "handle_error.sh"
 
     def test_regex_pattern_with_groups(self):
         """Test regex pattern with capture groups"""
@@ -64,29 +122,23 @@ class TestTriggerPattern:
         assert len(actions) == 1
         assert actions[0][1]["command"] == "deploy.sh feature staging"
 
-    def test_device_filtering(self):
+    @pytest.mark.parametrize(
+        "device, expected",
+        [
+            ("admin", 1),
+            ("superuser", 1),
+            ("regular_user", 0),
+        ],
+    )
+    def test_device_filtering(self, admin_trigger, device, expected):
         """Test device-based filtering"""
-        config = {
-            "triggers": {
-                "admin_trigger": {
-                    "match": {
-                        "pattern": "admin command",
-                        "from_devices": ["admin", "superuser"],
-                    },
-                    "action": {"template": "admin_action.sh"},
-                }
-            }
-        }
+        assert len(admin_trigger.check_message("admin command", device)) == expected
 
-        trigger = TriggerPattern(config)
-
-        # Allowed device
-        actions = trigger.check_message("admin command", "admin")
-        assert len(actions) == 1
-
-        # Not allowed device
-        actions = trigger.check_message("admin command", "regular_user")
-        assert len(actions) == 0
+    def test_device_allowlist_is_frozenset(self, admin_trigger):
+        """The allowlist is a set built once at construction"""
+        assert admin_trigger._compiled["admin_trigger"].from_devices == frozenset(
+            {"admin", "superuser"}
+        )
 
     def test_cooldown_condition(self):
         """Test cooldown period"""
@@ -102,24 +154,43 @@ class TestTriggerPattern:
 
         trigger = TriggerPattern(config)
 
-        # First trigger should work
-        actions = trigger.check_message("trigger", "device1")
-        assert len(actions) == 1
+        with patch("push_tmux.triggers.time.monotonic") as mock_monotonic:
+            mock_monotonic.return_value = 1000.0
+            # First trigger should work
+            actions = trigger.check_message("trigger", "device1")
+            assert len(actions) == 1
 
-        # Second trigger immediately should be blocked
-        actions = trigger.check_message("trigger", "device1")
-        assert len(actions) == 0
+            # Second trigger within the cooldown should be blocked
+            mock_monotonic.return_value = 1000.9
+            actions = trigger.check_message("trigger", "device1")
+            assert len(actions) == 0
 
-        # After cooldown, should work again
-        time.sleep(1.1)
-        actions = trigger.check_message("trigger", "device1")
-        assert len(actions) == 1
+            # After cooldown, should work again
+            mock_monotonic.return_value = 1001.0
+            actions = trigger.check_message("trigger", "device1")
+            assert len(actions) == 1
 
-    def test_max_per_hour_condition(self):
+    @pytest.mark.parametrize(
+        "previous, expected",
+        [
+            (0, 1),
+            (1, 1),
+            # Third should be blocked
+            (2, 0),
+        ],
+    )
+    def test_max_per_hour_condition(self, hourly_trigger, previous, expected):
         """Test max executions per hour"""
+        for _ in range(previous):
+            hourly_trigger.check_message("alert", "device1")
+
+        assert len(hourly_trigger.check_message("alert", "device1")) == expected
+
+    def test_max_per_hour_sliding_window(self):
+        """Test the hourly limit frees up as executions leave the window"""
         config = {
             "triggers": {
-                "hourly_limited": {
+                "window_limited": {
                     "match": {"pattern": "alert"},
                     "action": {"template": "alert.sh"},
                     "conditions": {"max_per_hour": 2},
@@ -129,12 +200,19 @@ class TestTriggerPattern:
 
         trigger = TriggerPattern(config)
 
-        # First two should work
-        assert len(trigger.check_message("alert", "device1")) == 1
-        assert len(trigger.check_message("alert", "device1")) == 1
+        with patch("push_tmux.triggers.time.monotonic") as mock_monotonic:
+            mock_monotonic.return_value = 1000.0
+            assert len(trigger.check_message("alert", "device1")) == 1
+            mock_monotonic.return_value = 2000.0
+            assert len(trigger.check_message("alert", "device1")) == 1
+            assert len(trigger.check_message("alert", "device1")) == 0
 
-        # Third should be blocked
-        assert len(trigger.check_message("alert", "device1")) == 0
+            # The first execution is more than an hour old
+            mock_monotonic.return_value = 4601.0
+            assert len(trigger.check_message("alert", "device1")) == 1
+            assert len(trigger.check_message("alert", "device1")) == 0
+
+        assert len(trigger.execution_history["window_limited"]) == 2
 
     def test_execute_once_condition(self):
         """Test execute_once condition"""
@@ -173,21 +251,93 @@ class TestTriggerPattern:
         trigger = TriggerPattern(config)
 
         with patch("push_tmux.triggers.datetime") as mock_datetime:
-            mock_datetime.now.return_value.isoformat.return_value = (
-                "2024-01-01T12:00:00"
-            )
-            mock_datetime.now.return_value.strftime.side_effect = [
-                "2024-01-01",
-                "12:00:00",
-            ]
+            # A real, frozen datetime: no side_effect ordering to keep in sync
+            mock_datetime.now.return_value = _FROZEN_NOW
 
             actions = trigger.check_message("test something", "mydevice")
 
-            assert len(actions) == 1
-            command = actions[0][1]["command"]
-            assert "'test something' from mydevice" in command
-            assert "matched: test something" in command
-            assert "group: something" in command
+        assert len(actions) == 1
+        command = actions[0][1]["command"]
+        assert "'test something' from mydevice" in command
+        assert "at 2024-01-01T12:00:00 " in command
+        assert "matched: test something" in command
+        assert "group: something" in command
+        variables = actions[0][1]["variables"]
+        assert (variables["date"], variables["time"]) == ("2024-01-01", "12:00:00")
+
+    def test_base_variables_shared_between_triggers(self):
+        """Test message-level variables are built once per message"""
+        config = {
+            "triggers": {
+                "first": {
+                    "match": {"pattern": "alert"},
+                    "action": {"template": "a {source_device} {timestamp}"},
+                },
+                "second": {
+                    "match": {"pattern": "alert (.+)"},
+                    "action": {"template": "b {group1} {timestamp}"},
+                },
+            }
+        }
+
+        trigger = TriggerPattern(config)
+
+        with patch("push_tmux.triggers.datetime") as mock_datetime:
+            mock_datetime.now.return_value.isoformat.return_value = "T"
+            actions = trigger.check_message("alert disk", "mydevice")
+
+        mock_datetime.now.return_value.isoformat.assert_called_once()
+        assert [a["command"] for _, a in actions] == ["a mydevice T", "b disk T"]
+        # Each action still gets its own variables dict
+        assert "group1" not in actions[0][1]["variables"]
+
+    def test_date_time_strings_reused_within_a_second(self):
+        """Test date/time are formatted once per second, not once per message"""
+        config = {
+            "triggers": {
+                "clock": {
+                    "match": {"pattern": "tick"},
+                    "action": {"template": "{date} {time}"},
+                }
+            }
+        }
+
+        trigger = TriggerPattern(config)
+
+        with patch("push_tmux.triggers.datetime") as mock_datetime:
+            now = mock_datetime.now.return_value
+            now.strftime.side_effect = ["2024-01-01", "12:00:00"]
+            first = trigger.check_message("tick", "device1")
+            second = trigger.check_message("tick", "device1")
+
+        assert now.strftime.call_count == 2
+        assert first[0][1]["command"] == second[0][1]["command"]
+        assert second[0][1]["command"] == "2024-01-01 12:00:00"
+
+    def test_template_format_spec_and_missing_variable(self):
+        """Test templates needing str.format and templates with unknown fields"""
+        config = {
+            "triggers": {
+                "padded": {
+                    "match": {"pattern": "job (\\d+)"},
+                    "action": {"template": "run {group1:>5}|{source_device!r}"},
+                },
+                "missing": {
+                    "match": {"pattern": "oops"},
+                    "action": {"template": "run {undefined}"},
+                },
+            }
+        }
+
+        trigger = TriggerPattern(config)
+        actions = trigger.check_message("job 42", "dev")
+        assert actions[0][1]["command"] == "run    42|'dev'"
+
+        with patch("push_tmux.triggers.click.echo") as mock_echo:
+            assert trigger.check_message("oops", "dev") == []
+        mock_echo.assert_called_once_with(
+            "Missing variable in template: 'undefined'", err=True
+        )
 
     def test_target_device_expansion(self):
         """Test target device name expansion for tmux session routing"""
@@ -230,11 +380,573 @@ class TestTriggerPattern:
         assert len(actions) == 1
         assert actions[0][1]["target_device"] == "monitoring"
 
+    def test_compiled_trigger_shared_between_instances(self):
+        """Test equivalent configs reuse the same compiled trigger"""
+        config = {
+            "triggers": {
+                "shared": {
+                    "match": {"pattern": "deploy (\\w+)"},
+                    "action": {
+                        "template": "deploy.sh",
+                        "target_device": "{group1}",
+                        "transforms": ["lower()", "prefix(env_)"],
+                    },
+                }
+            }
+        }
+
+        first = TriggerPattern(config)
+        second = TriggerPattern(copy.deepcopy(config))
+
+        assert first._compiled["shared"] is second._compiled["shared"]
+        actions = second.check_message("deploy PROD", "device1")
+        assert actions[0][1]["target_device"] == "env_prod"
+
+    def test_patterns_compiled_once(self):
+        """Test check_message never compiles regexes, however often it runs"""
+        config = {
+            "triggers": {
+                "compile_once_a": {
+                    "match": {"pattern": "compile-once-a (\\d+)"},
+                    "action": {"template": "a {group1}"},
+                },
+                "compile_once_b": {
+                    "match": {"pattern": "compile-once-b (\\w+)"},
+                    "action": {"template": "b {group1}"},
+                },
+            }
+        }
+
+        with patch.object(re, "compile", wraps=re.compile) as mock_compile:
+            trigger = TriggerPattern(config)
+            compiled_at_init = mock_compile.call_count
+
+            for i in range(50):
+                trigger.check_message(f"compile-once-a {i}", "device1")
+                trigger.check_message("compile-once-b x", "device1")
+                trigger.check_message("no match", "device1")
+
+        assert mock_compile.call_count == compiled_at_init
+
+    def test_transform_regex_shared_between_triggers(self):
+        """Test the same transform regex in different triggers is compiled once"""
+        config = {
+            "triggers": {
+                name: {
+                    "match": {"pattern": f"{name} (.+)"},
+                    "action": {
+                        "template": "run.sh",
+                        "target_device": "{group1}",
+                        "transforms": ["regex_extract([a-z]+)"],
+                    },
+                }
+                for name in ("first_cached", "second_cached")
+            }
+        }
+
+        hits = _compile_regex.cache_info().hits
+        trigger = TriggerPattern(config)
+
+        first, second = (
+            trigger._compiled[name].transforms[0].regex
+            for name in ("first_cached", "second_cached")
+        )
+        assert first is second
+        assert _compile_regex.cache_info().hits > hits
+
+
+class TestLiteralPrefilter:
+    """Test literal prefix prefiltering of match patterns"""
+
+    @pytest.mark.parametrize(
+        "pattern, case_sensitive, expected",
+        [
+            ("from (.+)", True, "from "),
+            ("ERROR", False, "error"),
+            ("^deploy (\\w+)", True, "deploy "),
+            ("colou?r", True, "colo"),
+            ("ERROR|WARNING", True, ""),
+            ("(?i)error", True, ""),
+            ("エラー.*", False, ""),
+            ("エラー.*", True, "エラー"),
+        ],
+    )
+    def test_literal_prefix(self, pattern, case_sensitive, expected):
+        """Test prefix extraction only returns literals every match contains"""
+        assert _literal_prefix(pattern, case_sensitive) == expected
+
+    def test_prefilter_keeps_unicode_case_folding(self):
+        """Test characters IGNORECASE folds to ASCII still pass the prefilter"""
+        config = {
+            "triggers": {
+                "file_trigger": {
+                    "match": {"pattern": "file"},
+                    "action": {"template": "handle.sh"},
+                }
+            }
+        }
+
+        trigger = TriggerPattern(config)
+
+        # "ı" (dotless i) matches "i" under re.IGNORECASE
+        assert len(trigger.check_message("FıLE saved", "device1")) == 1
+        assert len(trigger.check_message("nothing here", "device1")) == 0
+
+    @pytest.mark.parametrize(
+        "pattern, case_sensitive, expected",
+        [
+            ("ERROR|WARNING|CRITICAL", True, ("ERROR", "WARNING", "CRITICAL")),
+            ("ERROR|WARNING", False, ("error", "warning")),
+            ("ERROR", True, ()),
+            ("ERROR|", True, ()),
+            ("(ERROR|WARNING)", True, ()),
+            ("ERR.R|WARNING", True, ()),
+            ("エラー|警告", False, ()),
+        ],
+    )
+    def test_alternation_literals(self, pattern, case_sensitive, expected):
+        """Test only pure literal alternations produce needles"""
+        assert _alternation_literals(pattern, case_sensitive) == expected
+
+    def test_alternation_needles_skip_regex(self):
+        """Test messages containing no alternative never reach the regex"""
+        config = {
+            "triggers": {
+                "severity": {
+                    "match": {"pattern": "ERROR|WARNING|CRITICAL"},
+                    "action": {"template": "notify.sh {match_text}"},
+                }
+            }
+        }
+
+        trigger = TriggerPattern(config)
+        compiled = trigger._compiled["severity"]
+        search = MagicMock(wraps=compiled.match_re.search)
+        trigger._compiled["severity"] = compiled._replace(
+            match_re=MagicMock(search=search), re2_match=None
+        )
+        trigger._reject_re = None
+
+        assert trigger.check_message("all systems nominal", "device1") == []
+        search.assert_not_called()
+
+        actions = trigger.check_message("disk warning on /", "device1")
+        assert actions[0][1]["command"] == "notify.sh warning"
+        search.assert_called_once()
+
+
+class TestLiteralMatching:
+    """Test triggers whose pattern is a plain literal"""
+
+    def test_literal_pattern_skips_regex(self):
+        """Test literal patterns are matched with str.find, keeping match_text"""
+        config = {
+            "triggers": {
+                "alert": {
+                    "match": {"pattern": "Disk Full"},
+                    "action": {"template": "alert {match_text}"},
+                }
+            }
+        }
+
+        trigger = TriggerPattern(config)
+        compiled = trigger._compiled["alert"]
+        assert compiled.literal_only
+
+        # Any regex search would fail the test
+        regex = MagicMock(search=MagicMock(side_effect=AssertionError))
+        trigger._compiled["alert"] = compiled._replace(
+            match_re=regex, re2_match=None
+        )
+        actions = trigger.check_message("warning: DISK FULL on /", "device1")
+        assert actions[0][1]["command"] == "alert DISK FULL"
+        assert actions[0][1]["variables"]["match"] == "DISK FULL"
+
+    def test_literal_pattern_non_ascii_message(self):
+        """Test non-ASCII messages keep re's case folding"""
+        config = {
+            "triggers": {
+                "file": {
+                    "match": {"pattern": "file"},
+                    "action": {"template": "got {match}"},
+                }
+            }
+        }
+
+        trigger = TriggerPattern(config)
+        actions = trigger.check_message("保存: FıLE", "device1")
+        assert actions[0][1]["command"] == "got FıLE"
+
+
+class TestAnchoredPatterns:
+    """Test anchored triggers and start-anchored patterns"""
+
+    @pytest.mark.parametrize(
+        "pattern, anchored, expected",
+        [
+            ("alert", True, "fullmatch"),
+            ("^deploy (\\w+)", False, "match"),
+            ("^deploy|rollback", False, "search"),
+            ("alert", False, "search"),
+        ],
+    )
+    def test_scan_method(self, pattern, anchored, expected):
+        """Test which pattern method each trigger runs"""
+        assert _scan_method(pattern, anchored) == expected
+
+    @pytest.mark.parametrize(
+        "pattern, regex, message, expected",
+        [
+            ("alert", True, "alert", 1),
+            ("alert", True, "ALERT", 1),
+            ("alert", True, "x alert", 0),
+            ("alert", True, "alert x", 0),
+            ("al(e)rt", True, "alert", 1),
+            ("al(e)rt", True, "x alert", 0),
+            ("alert", False, "Alert", 1),
+            ("alert", False, "x alert", 0),
+        ],
+    )
+    def test_anchored_matches_whole_message(self, pattern, regex, message, expected):
+        """Test anchored=True only matches the entire message"""
+        config = {
+            "triggers": {
+                "alert": {
+                    "match": {"pattern": pattern, "regex": regex, "anchored": True},
+                    "action": {"template": "alert.sh"},
+                }
+            }
+        }
+
+        trigger = TriggerPattern(config)
+        assert len(trigger.check_message(message, "device1")) == expected
+
+    def test_start_anchored_pattern_uses_match(self):
+        """Test ^ patterns run re.match instead of re.search"""
+        config = {
+            "triggers": {
+                "deploy": {
+                    "match": {"pattern": "^deploy (\\w+)"},
+                    "action": {"template": "deploy.sh {group1}"},
+                }
+            }
+        }
+
+        trigger = TriggerPattern(config)
+        compiled = trigger._compiled["deploy"]
+        regex = MagicMock(
+            match=MagicMock(wraps=compiled.match_re.match),
+            search=MagicMock(side_effect=AssertionError),
+        )
+        trigger._compiled["deploy"] = compiled._replace(
+            match_re=regex, re2_match=None
+        )
+
+        actions = trigger.check_message("deploy web", "device1")
+        assert actions[0][1]["command"] == "deploy.sh web"
+        assert trigger.check_message("please deploy web", "device1") == []
+
+
+class TestRe2Matching:
+    """Test routing of trigger patterns to the linear-time RE2 engine"""
+
+    @pytest.fixture(autouse=True)
+    def _require_re2(self):
+        pytest.importorskip("re2")
+
+    @pytest.mark.parametrize(
+        "pattern, case_sensitive, expected",
+        [
+            ("deploy (.+)", True, (True, False)),
+            ("deploy (.+)", False, (True, True)),
+            ("deploy (\\w+)", True, (True, True)),
+            ("(a)\\1", True, (False, False)),  # Backreference
+            ("foo(?=bar)", True, (False, False)),  # Lookahead
+            ("end$", True, (False, False)),
+            ("a\\sb", True, (False, False)),
+            ("x{,3}", True, (False, False)),
+            # Captures inside repeated groups differ on empty iterations
+            ("(a*)*b", True, (False, False)),
+            ("(?:(a*))*b", True, (False, False)),
+            ("(?P<x>a*)+b", True, (False, False)),
+            ("(?:a+)+b", True, (True, False)),
+            ("[)(]+(a)", True, (True, False)),
+            ("[]a)]*(b)", True, (True, False)),
+            # RE2 does not fold "ı" and "İ" like re does
+            ("ı", False, (False, False)),
+            ("(?:İ)x?", False, (False, False)),
+            ("ı", True, (True, False)),
+        ],
+    )
+    def test_re2_routing(self, pattern, case_sensitive, expected):
+        """Test only patterns with identical semantics are compiled with RE2"""
+        compiled, ascii_only = _compile_re2_pattern(pattern, case_sensitive)
+        assert (compiled is not None, ascii_only) == expected
+
+    @pytest.mark.parametrize("pattern", ["(a*)*b", "(a*)+b", "(?:(a*))*b"])
+    def test_repeated_group_captures_match_re(self, pattern):
+        """Test group values equal re's for repeated groups that can match empty"""
+        config = {
+            "triggers": {
+                "repeat": {
+                    "match": {"pattern": pattern, "case_sensitive": True},
+                    "action": {"template": "got [{group1}]"},
+                }
+            }
+        }
+
+        trigger = TriggerPattern(config)
+        actions = trigger.check_message("aab", "device1")
+
+        expected = re.search(pattern, "aab").group(1)
+        assert actions[0][1]["command"] == f"got [{expected}]"
+
+    def test_re2_match_variables(self):
+        """Test RE2 matches expose the same variables as re matches"""
+        config = {
+            "triggers": {
+                "deploy": {
+                    "match": {"pattern": "deploy (?P<env>\\w+)( now)?"},
+                    "action": {
+                        "template": "deploy.sh {env} {group1} {match}",
+                        "target_device": "{env}",
+                    },
+                }
+            }
+        }
+
+        trigger = TriggerPattern(config)
+        actions = trigger.check_message("please DEPLOY prod", "device1")
+
+        assert len(actions) == 1
+        assert actions[0][1]["command"] == "deploy.sh prod prod DEPLOY prod"
+        assert actions[0][1]["target_device"] == "prod"
+
+        # Non-ASCII messages fall back to re for Unicode \w
+        actions = trigger.check_message("deploy 本番", "device1")
+        assert actions[0][1]["target_device"] == "本番"
+
+    @pytest.mark.parametrize(
+        "pattern, message", [("ı", "FILE"), ("(?:İ)x?", "i")]
+    )
+    def test_non_ascii_case_folding(self, pattern, message):
+        """Test case-insensitive non-ASCII patterns fold like re"""
+        config = {
+            "triggers": {
+                "fold": {
+                    "match": {"pattern": pattern, "case_sensitive": False},
+                    "action": {"template": "echo {match}"},
+                }
+            }
+        }
+
+        trigger = TriggerPattern(config)
+
+        assert len(trigger.check_message(message, "device1")) == 1
+
+    def test_lone_surrogate_message(self):
+        """Test messages RE2 cannot encode as UTF-8 are matched with re"""
+        config = {
+            "triggers": {
+                "deploy": {
+                    "match": {"pattern": "deploy (.+)", "case_sensitive": True},
+                    "action": {"template": "deploy.sh {group1}"},
+                }
+            }
+        }
+        message = json.loads('"deploy \\ud800 now"')
+
+        trigger = TriggerPattern(config)
+        actions = trigger.check_message(message, "device1")
+
+        assert actions[0][1]["command"] == "deploy.sh \ud800 now"
+
+
+class TestRejectFilter:
+    """Test the combined alternation used to reject non-matching messages"""
+
+    CONFIG = {
+        "triggers": {
+            "error": {
+                "match": {"pattern": "ERROR: (.+)"},
+                "action": {"template": "log {group1}"},
+            },
+            "deploy": {
+                "match": {"pattern": "deploy (\\w+)", "case_sensitive": True},
+                "action": {"template": "deploy.sh {group1}"},
+            },
+            "repeat": {
+                "match": {"pattern": "([0-9])\\1"},  # Backreference
+                "action": {"template": "repeat {group1}"},
+            },
+        }
+    }
+
+    @pytest.mark.parametrize("use_re2", [True, False])
+    def test_reject_filter_members(self, use_re2, monkeypatch):
+        """Test only patterns that keep their meaning are combined"""
+        if use_re2:
+            pytest.importorskip("re2")
+        else:
+            monkeypatch.setattr("push_tmux.triggers.re2", None)
+
+        trigger = TriggerPattern(self.CONFIG)
+        assert trigger._reject_re is not None
+        assert trigger._reject_names == frozenset({"error", "deploy"})
+
+    @pytest.mark.parametrize("use_re2", [True, False])
+    def test_reject_filter_results(self, use_re2, monkeypatch):
+        """Test results are unchanged by the reject filter"""
+        if use_re2:
+            pytest.importorskip("re2")
+        else:
+            monkeypatch.setattr("push_tmux.triggers.re2", None)
+
+        trigger = TriggerPattern(self.CONFIG)
+
+        def names(message):
+            return [name for name, _ in trigger.check_message(message, "device1")]
+
+        assert names("error: disk") == ["error"]
+        assert names("DEPLOY prod") == []
+        assert names("deploy 本番") == ["deploy"]
+        assert names("code 1100") == ["repeat"]
+        assert names("nothing") == []
+
+    @pytest.mark.parametrize("use_re2", [True, False])
+    def test_conditional_group_reference_not_combined(self, use_re2, monkeypatch):
+        """Test (?(1)...) keeps referring to its own group"""
+        if use_re2:
+            pytest.importorskip("re2")
+        else:
+            monkeypatch.setattr("push_tmux.triggers.re2", None)
+
+        config = {
+            "triggers": {
+                "a": {
+                    "match": {"pattern": "(x)zzz"},
+                    "action": {"template": "a"},
+                },
+                "b": {
+                    "match": {"pattern": "(y)?(?(1)c|d)"},
+                    "action": {"template": "b"},
+                },
+            }
+        }
+
+        trigger = TriggerPattern(config)
+        assert "b" not in trigger._reject_names
+        assert [name for name, _ in trigger.check_message("yc", "device1")] == ["b"]
+
+    @pytest.mark.parametrize("use_re2", [True, False])
+    def test_non_ascii_case_folding(self, use_re2, monkeypatch):
+        """Test members folding non-ASCII letters are not rejected by RE2"""
+        if use_re2:
+            pytest.importorskip("re2")
+        else:
+            monkeypatch.setattr("push_tmux.triggers.re2", None)
+
+        config = {
+            "triggers": {
+                "dotless": {
+                    "match": {"pattern": "ı"},
+                    "action": {"template": "dotless"},
+                },
+                "error": {
+                    "match": {"pattern": "ERROR: (.+)"},
+                    "action": {"template": "log {group1}"},
+                },
+            }
+        }
+
+        trigger = TriggerPattern(config)
+        names = [name for name, _ in trigger.check_message("FILE", "device1")]
+        assert names == ["dotless"]
+
+    @pytest.mark.parametrize("use_re2", [True, False])
+    def test_lone_surrogate_message(self, use_re2, monkeypatch):
+        """Test messages RE2 cannot encode are left to the member triggers"""
+        if use_re2:
+            pytest.importorskip("re2")
+        else:
+            monkeypatch.setattr("push_tmux.triggers.re2", None)
+
+        config = {
+            "triggers": {
+                "error": {
+                    "match": {"pattern": "ERROR: (.+)", "case_sensitive": True},
+                    "action": {"template": "log {group1}"},
+                },
+                "deploy": {
+                    "match": {"pattern": "deploy (.+)", "case_sensitive": True},
+                    "action": {"template": "deploy.sh {group1}"},
+                },
+            }
+        }
+        message = json.loads('"deploy \\ud800 now"')
+
+        trigger = TriggerPattern(config)
+        assert trigger._reject_re is not None
+        actions = trigger.check_message(message, "device1")
+        assert [action["command"] for _, action in actions] == [
+            "deploy.sh \ud800 now"
+        ]
+
+
+class TestCheckMessages:
+    """Test batch checking of messages"""
+
+    def test_check_messages_matches_per_message(self):
+        """Test batch results equal per-message results, including cooldowns"""
+        config = {
+            "triggers": {
+                "error": {
+                    "match": {"pattern": "ERROR: (.+)"},
+                    "action": {"template": "log {group1}"},
+                    "conditions": {"cooldown": 60},
+                },
+                "deploy": {
+                    "match": {"pattern": "deploy (\\w+)"},
+                    "action": {"template": "deploy.sh {group1}"},
+                },
+            }
+        }
+        messages = ["ERROR: disk", "deploy prod", "ERROR: again", "noise"]
+
+        batch = TriggerPattern(config).check_messages(messages, "device1")
+        single = TriggerPattern(config)
+        expected = [single.check_message(m, "device1") for m in messages]
+
+        assert [[name for name, _ in r] for r in batch] == [
+            ["error"],
+            ["deploy"],
+            [],
+            [],
+        ]
+        assert [[a["command"] for _, a in r] for r in batch] == [
+            [a["command"] for _, a in r] for r in expected
+        ]
+
+    def test_check_messages_skips_absent_literals(self):
+        """Test triggers whose literal is absent from the batch are not matched"""
+        config = {
+            "triggers": {
+                "error": {
+                    "match": {"pattern": "ERROR: (.+)"},
+                    "action": {"template": "log {group1}"},
+                }
+            }
+        }
+
+        trigger = TriggerPattern(config)
+        trigger._match_trigger = mock_match = MagicMock()
+        assert trigger.check_messages(["ok", "fine"], "device1") == [[], []]
+        mock_match.assert_not_called()
+
 
 class TestProcessTriggerActions:
     """Test process_trigger_actions function"""
 
-    @pytest.mark.asyncio
     @patch("push_tmux.tmux.send_to_tmux")
     @patch("push_tmux.triggers.click")
     async def test_execute_command(self, mock_click, mock_send_to_tmux):
@@ -257,6 +969,13 @@ class TestProcessTriggerActions:
 class TestCheckTriggers:
     """Test check_triggers function"""
 
+    @pytest.fixture(autouse=True)
+    def _fresh_trigger_patterns(self):
+        """Start each test without TriggerPatterns cached by earlier tests"""
+        _get_trigger_pattern.cache_clear()
+        yield
+        _get_trigger_pattern.cache_clear()
+
     def test_check_triggers_integration(self):
         """Test full trigger checking flow"""
         config = {
@@ -287,6 +1006,32 @@ class TestCheckTriggers:
         actions = check_triggers("no match", "allowed", config)
         assert len(actions) == 0
 
+    def test_check_triggers_reuses_trigger_pattern(self):
+        """Test one TriggerPattern serves repeated calls with the same config"""
+        config = {
+            "triggers": {
+                "reuse_trigger": {
+                    "match": {"pattern": "reuse (\\d+)"},
+                    "action": {"template": "reuse {group1}"},
+                    "conditions": {"cooldown": 60},
+                }
+            }
+        }
+
+        with patch(
+            "push_tmux.triggers.TriggerPattern.__init__",
+            side_effect=TriggerPattern.__init__,
+            autospec=True,
+        ) as mock_init:
+            first = check_triggers("reuse 1", "device1", config)
+            for i in range(1000):
+                check_triggers(f"no match {i}", "device1", copy.deepcopy(config))
+
+        assert mock_init.call_count == 1
+        assert [action["command"] for _, action in first] == ["reuse 1"]
+        # Cooldown state is kept between calls
+        assert check_triggers("reuse 2", "device1", config) == []
+
 
 class TestComplexPatterns:
     """Test complex pattern scenarios"""
@@ -320,6 +1065,16 @@ class TestComplexPatterns:
         assert "error_log" in trigger_names
         assert "critical_alert" in trigger_names
         assert "any_problem" in trigger_names
+        assert trigger._reject_names == frozenset(trigger_names)
+
+        # The combined filter only rejects; every trigger is still reported
+        for message, expected in [
+            ("WARNING: disk", ["any_problem"]),
+            ("CRITICAL", ["critical_alert", "any_problem"]),
+            ("all good", []),
+        ]:
+            actions = trigger.check_message(message, "device1")
+            assert [action[0] for action in actions] == expected
 
     def test_named_capture_groups(self):
         """Test regex with named capture groups"""
@@ -1,9 +1,8 @@
-#!/usr/bin/env python3
 """
 テスト用ヘルパー関数
 """
 
-from unittest.mock import MagicMock, AsyncMock
+from unittest.mock import AsyncMock
 
 
 def create_tmux_mock(
@@ -22,38 +21,30 @@ def create_tmux_mock(
 
     async def mock_exec(*args, **kwargs):
         if "has-session" in args:
-            result = MagicMock()
             # 指定されたセッションが存在するかチェック
-            for session in existing_sessions:
-                if session in args:
-                    result.wait = AsyncMock(return_value=0)
-                    result.returncode = 0
-                    result.communicate = AsyncMock(return_value=(b"", b""))
-                    return result
-            # セッションが存在しない場合
-            result.wait = AsyncMock(return_value=1)
-            result.returncode = 1
-            result.communicate = AsyncMock(return_value=(b"", b""))
+            exists = any(session in args for session in existing_sessions)
+            result = AsyncMock()
+            result.returncode = 0 if exists else 1
+            result.wait.return_value = result.returncode
+            result.communicate.return_value = (b"", None)
             return result
         elif "display-message" in args:
-            result = MagicMock()
+            result = AsyncMock()
             result.returncode = 0
-            result.communicate = AsyncMock(
-                return_value=(f"{current_session}\n".encode(), b"")
-            )
+            result.communicate.return_value = (f"{current_session}\n".encode(), None)
             return result
         elif "list-windows" in args:
-            result = MagicMock()
-            result.communicate = AsyncMock(return_value=(f"{windows}\n".encode(), b""))
+            result = AsyncMock()
+            result.communicate.return_value = (f"{windows}\n".encode(), None)
             return result
         elif "list-panes" in args:
-            result = MagicMock()
-            result.communicate = AsyncMock(return_value=(f"{panes}\n".encode(), b""))
+            result = AsyncMock()
+            result.communicate.return_value = (f"{panes}\n".encode(), None)
             return result
         else:
             # send-keysなど、他のコマンドの場合
-            process = MagicMock()
-            process.wait = AsyncMock(return_value=None)
+            process = AsyncMock()
+            process.wait.return_value = None
             return process
 
     return mock_exec